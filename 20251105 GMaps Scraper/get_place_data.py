@@ -1,6 +1,7 @@
 import time
 import csv
 import re
+import json
 import logging
 import os
 import random
@@ -11,6 +12,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 from scrapy import Selector
 
 # egyszerű fájl alapú logolás
@@ -45,9 +47,77 @@ BATCH_PAUSE = 60              # 1 min pause between batches
 MIN_DELAY = 5                  # Min seconds between requests
 MAX_DELAY = 12                 # Max seconds between requests
 DRIVER_RESTART_EVERY = 100     # New browser (new user-agent) every N links
+RETRY_BASE_DELAY = 2           # Base seconds between get_place_data attempts (doubled per attempt)
+
+# Assets the scraper never reads: map tiles, photos/avatars, webfonts
+BLOCKED_URL_PATTERNS = [
+    "*.gstatic.com/images/*",
+    "*.googleusercontent.com/*",
+    "fonts.googleapis.com/*",
+    "fonts.gstatic.com/*",
+    "maps.gstatic.com/maps/vt/*",
+]
+
+REVIEW_SELECTOR = 'div[data-review-id]'
+
+# The XHR the review panel fires for each page of reviews (JSON behind an XSSI prefix)
+REVIEW_XHR_MARKERS = ('listugcposts',)
+# Positions inside one review entry of the listugcposts payload
+RPC_RATING_PATH = (0, 2, 0, 0)
+RPC_REPLY_PATH = (0, 3, 14)
+
+CONSENT_BUTTON_XPATHS = (
+    "//button[contains(., 'Accept all')]",
+    "//button[contains(., 'Reject all')]",
+    "//button[contains(., 'Accept')]",
+    "//button[contains(., 'I agree')]",
+    "//button[contains(., 'Elfogadom')]",
+    "//button[contains(., 'Összes elfogadása')]",
+    "//button[@aria-label='Accept all']",
+    "//form//button[1]",
+)
 
+REVIEW_PANEL_SELECTORS = (
+    'div.m6QErb.DxyBCb.kA9KIf.dS8AEf',
+    'div.m6QErb.DxyBCb.kA9KIf',
+    'div.m6QErb',
+)
+
+REVIEW_TAB_SELECTORS = (
+    "button[aria-label*='Reviews']",
+    "button[aria-label*='review']",
+    "button.hh2c6[data-tab-index='1']",
+)
 
-def create_driver():
+COORDS_RE = re.compile(r'!3d([^!]+)!4d([^!]+)')
+RATING_RE = re.compile(r'([\d.,]+)')
+COUNT_RE = re.compile(r'([\d,]+)')
+STARS_RE = re.compile(r'(\d+)')
+
+# Runs in the page: one [stars, answered] pair per loaded review, in a single round-trip
+COUNT_REVIEWS_JS = """
+const out = [];
+for (const r of document.querySelectorAll(arguments[0])) {
+    let answered = !!r.querySelector('div.CDe7pd, div[class*="owner-response"]');
+    if (!answered) {
+        for (const s of r.querySelectorAll('span')) {
+            if ((s.textContent || '').includes('Response from')) { answered = true; break; }
+        }
+    }
+    const star = r.querySelector('span[role="img"][aria-label*="star"]');
+    const m = star ? (star.getAttribute('aria-label') || '').match(/\\d+/) : null;
+    out.push([m ? parseInt(m[0], 10) : 0, answered]);
+}
+return out;
+"""
+
+
+def create_driver(capture_reviews=False):
+    """
+    capture_reviews: record network events in the performance log so review XHRs
+    can be read back (audit drivers). Off for the bulk pipeline, which counts
+    reviews in the DOM and would otherwise pile up events for every place.
+    """
     from selenium.webdriver.chrome.options import Options
 
     options = Options()
@@ -66,6 +136,14 @@ def create_driver():
     options.add_argument("--incognito")
     options.add_argument("--disable-extensions")
     options.add_argument("--disable-plugins")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.fonts": 2,
+        "intl.accept_languages": "en-US,en",
+    })
+    if capture_reviews:
+        # Network events land in the performance log, so review XHRs can be read back
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
     ua = random.choice(USER_AGENTS)
     options.add_argument(f"user-agent={ua}")
@@ -84,9 +162,24 @@ def create_driver():
         """
     })
 
+    # Scripts/XHR stay enabled (reviews are loaded by XHR)
+    if capture_reviews:
+        driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    driver.capture_reviews = capture_reviews
+
     return driver
 
 
+def discard_performance_log(driver):
+    """Drop buffered network events so only the current place's events are read."""
+    if getattr(driver, "capture_reviews", False):
+        try:
+            driver.get_log("performance")
+        except Exception:
+            pass
+
+
 def random_delay(min_sec=None, max_sec=None):
     """Sleep for a random duration to appear more human."""
     min_s = min_sec or MIN_DELAY
@@ -110,7 +203,7 @@ def read_links_from_file(filename="links.txt"):
 
 def extract_coordinates_from_url(url):
     """Extract latitude and longitude from Google Maps URL."""
-    coord_match = re.search(r'!3d([^!]+)!4d([^!]+)', url)
+    coord_match = COORDS_RE.search(url)
     if coord_match:
         try:
             lat = float(coord_match.group(1))
@@ -129,18 +222,7 @@ def accept_google_consent(driver, timeout=3):
 
         print("  🔍 Consent popup detected, attempting to handle...")
 
-        consent_buttons = [
-            "//button[contains(., 'Accept all')]",
-            "//button[contains(., 'Reject all')]",
-            "//button[contains(., 'Accept')]",
-            "//button[contains(., 'I agree')]",
-            "//button[contains(., 'Elfogadom')]",
-            "//button[contains(., 'Összes elfogadása')]",
-            "//button[@aria-label='Accept all']",
-            "//form//button[1]",
-        ]
-
-        for xpath in consent_buttons:
+        for xpath in CONSENT_BUTTON_XPATHS:
             try:
                 button = WebDriverWait(driver, timeout).until(
                     EC.element_to_be_clickable((By.XPATH, xpath))
@@ -160,19 +242,90 @@ def accept_google_consent(driver, timeout=3):
         return False
 
 
-def scroll_reviews(driver, max_scrolls=50, scroll_pause=1.5):
+def _dig(obj, path):
+    for i in path:
+        try:
+            obj = obj[i]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return obj
+
+
+def parse_review_payload(body):
+    """
+    [stars, answered] pairs and the next-page cursor from one listugcposts response.
+    The cursor is empty/None on the last page.
+    """
+    if body.startswith(")]}'"):
+        body = body[4:]
+    data = json.loads(body)
+
+    reviews = []
+    for entry in _dig(data, (2,)) or []:
+        stars = _dig(entry, RPC_RATING_PATH)
+        reviews.append([stars if stars in (1, 2, 3, 4, 5) else 0, bool(_dig(entry, RPC_REPLY_PATH))])
+    return reviews, _dig(data, (1,))
+
+
+def review_pairs_usable(reviews):
+    """
+    Sanity check on the RPC offsets: at least one pair must carry a 1-5 star rating.
+    If RPC_RATING_PATH no longer matches Google's payload, every entry parses as 0 stars.
+    """
+    return any(stars for stars, _ in reviews)
+
+
+def new_review_capture():
+    return {'pending': set(), 'reviews': [], 'last_page': False}
+
+
+def drain_review_xhr(driver, capture):
+    """
+    Read finished review XHRs from Chrome's performance log and append their
+    [stars, answered] pairs to capture['reviews']. Returns the number added.
+    """
+    added = 0
+    for entry in driver.get_log("performance"):
+        try:
+            msg = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = msg.get("method")
+        params = msg.get("params", {})
+
+        if method == "Network.responseReceived":
+            url = params.get("response", {}).get("url", "")
+            if any(marker in url for marker in REVIEW_XHR_MARKERS):
+                capture['pending'].add(params.get("requestId"))
+        elif method == "Network.loadingFinished" and params.get("requestId") in capture['pending']:
+            request_id = params["requestId"]
+            capture['pending'].discard(request_id)
+            try:
+                resp = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                reviews, cursor = parse_review_payload(resp.get("body", ""))
+            except Exception as e:
+                logging.warning(f"Could not read review XHR {request_id}: {e}")
+                continue
+            capture['reviews'].extend(reviews)
+            added += len(reviews)
+            if not cursor:
+                capture['last_page'] = True
+    return added
+
+
+def scroll_reviews(driver, max_scrolls=50, scroll_pause=1.5, capture=None, expected_total=None):
     """
     Scroll through all reviews in the review panel.
     Returns when no new reviews are loading.
-    """
-    scrollable_selectors = [
-        'div.m6QErb.DxyBCb.kA9KIf.dS8AEf',
-        'div.m6QErb.DxyBCb.kA9KIf',
-        'div.m6QErb',
-    ]
+    scroll_pause is the max wait per scroll; it returns as soon as new reviews appear.
 
+    With a capture (new_review_capture()), progress is read from the review XHRs
+    instead of the DOM, and scrolling stops as soon as the last page arrives.
+    If no XHR shows up after the first scrolls, it falls back to DOM counting.
+    expected_total (the place's review count) ends scrolling as soon as that many are loaded.
+    """
     scrollable = None
-    for sel in scrollable_selectors:
+    for sel in REVIEW_PANEL_SELECTORS:
         try:
             scrollable = driver.find_element(By.CSS_SELECTOR, sel)
             break
@@ -186,17 +339,49 @@ def scroll_reviews(driver, max_scrolls=50, scroll_pause=1.5):
     last_review_count = 0
     stale_count = 0
 
+    if capture is not None:
+        try:
+            drain_review_xhr(driver, capture)
+        except Exception as e:
+            logging.warning(f"Review XHR capture unavailable, counting DOM: {e}")
+            capture = None
+
     for scroll_num in range(max_scrolls):
+        if capture is not None and capture['last_page']:
+            print(f"  📜 Last review page received. Total reviews loaded: {len(capture['reviews'])}")
+            return
+
         driver.execute_script(
             "arguments[0].scrollTop = arguments[0].scrollHeight",
             scrollable
         )
-        time.sleep(scroll_pause)
 
-        reviews = driver.find_elements(
-            By.CSS_SELECTOR, 'div[data-review-id]'
-        )
-        current_count = len(reviews)
+        if capture is not None:
+            try:
+                WebDriverWait(driver, scroll_pause, poll_frequency=0.2).until(
+                    lambda d: drain_review_xhr(d, capture) > 0 or capture['last_page']
+                )
+            except TimeoutException:
+                pass
+
+            current_count = len(capture['reviews'])
+            if current_count == 0 and scroll_num >= 2:
+                print("  ⚠️  No review XHR captured, counting reviews in the DOM")
+                capture = None
+                continue
+        else:
+            try:
+                WebDriverWait(driver, scroll_pause, poll_frequency=0.2).until(
+                    lambda d: len(d.find_elements(By.CSS_SELECTOR, REVIEW_SELECTOR)) > last_review_count
+                )
+            except TimeoutException:
+                pass
+
+            current_count = len(driver.find_elements(By.CSS_SELECTOR, REVIEW_SELECTOR))
+
+        if expected_total and current_count >= expected_total:
+            print(f"  📜 All {expected_total} reviews loaded. Total reviews loaded: {current_count}")
+            return
 
         if current_count == last_review_count:
             stale_count += 1
@@ -213,9 +398,49 @@ def scroll_reviews(driver, max_scrolls=50, scroll_pause=1.5):
     print(f"  📜 Max scrolls reached. Reviews loaded: {last_review_count}")
 
 
-def count_unanswered_reviews(driver, max_reviews_to_check=None):
+def parse_reviews_from_source(page_source):
+    """
+    Same [stars, answered] pairs as COUNT_REVIEWS_JS, from one page_source snapshot.
+    Parsed in-process with Scrapy's Selector, no per-element driver calls.
+    """
+    reviews = []
+    for review in Selector(text=page_source).css(REVIEW_SELECTOR):
+        is_answered = bool(
+            review.css('div.CDe7pd')
+            or review.xpath('.//span[contains(text(), "Response from")]')
+            or review.xpath('.//div[contains(@class, "owner-response")]')
+        )
+        star_label = review.css('span[role="img"][aria-label*="star"]::attr(aria-label)').get('')
+        star_match = STARS_RE.search(star_label)
+        stars = int(star_match.group(1)) if star_match else 0
+        reviews.append([stars, is_answered])
+    return reviews
+
+
+def count_unanswered_reviews(driver, max_reviews_to_check=None, reviews=None):
     """
     Count total reviews and unanswered reviews on the current page.
+    reviews: [stars, answered] pairs already collected (e.g. from the review XHRs);
+    when given, the DOM is not read.
+    """
+    if reviews is None:
+        try:
+            reviews = driver.execute_script(COUNT_REVIEWS_JS, REVIEW_SELECTOR) or []
+        except Exception as e:
+            logging.warning(f"In-page review count failed, parsing page source: {e}")
+            try:
+                reviews = parse_reviews_from_source(driver.page_source)
+            except Exception as e:
+                print(f"  ⚠️  Error counting reviews: {e}")
+                logging.error(f"Error counting reviews: {e}")
+                reviews = []
+
+    return review_stats_from_pairs(reviews)
+
+
+def review_stats_from_pairs(reviews):
+    """
+    Aggregate [stars, answered] pairs into the review stats dict.
     """
     result = {
         'total_reviews_loaded': 0,
@@ -232,68 +457,69 @@ def count_unanswered_reviews(driver, max_reviews_to_check=None):
         'stars_1': 0,
     }
 
-    try:
-        review_elements = driver.find_elements(By.CSS_SELECTOR, 'div[data-review-id]')
-        total = len(review_elements)
-        result['total_reviews_loaded'] = total
+    total = len(reviews)
+    result['total_reviews_loaded'] = total
 
-        if total == 0:
-            return result
+    if total == 0:
+        return result
 
-        answered = 0
-        for review_el in review_elements:
-            try:
-                owner_responses = review_el.find_elements(
-                    By.CSS_SELECTOR, 'div.CDe7pd'
-                )
-                if not owner_responses:
-                    owner_responses = review_el.find_elements(
-                        By.XPATH, './/span[contains(text(), "Response from")]'
-                    )
-                if not owner_responses:
-                    owner_responses = review_el.find_elements(
-                        By.XPATH, './/div[contains(@class, "owner-response")]'
-                    )
-
-                # Star rating kiolvasás
-                try:
-                    star_el = review_el.find_element(By.CSS_SELECTOR, 'span[role="img"][aria-label*="star"]')
-                    star_label = star_el.get_attribute('aria-label')
-                    star_match = re.search(r'(\d+)', star_label)
-                    stars = int(star_match.group(1)) if star_match else 0
-                except:
-                    stars = 0
+    answered = 0
+    for stars, is_answered in reviews:
+        is_negative = stars in (1, 2)
 
-                is_negative = stars in (1, 2)
-                is_answered = bool(owner_responses)
+        # Star distribution counting
+        if stars in (1, 2, 3, 4, 5):
+            result[f'stars_{stars}'] += 1
 
-                # Star distribution counting
-                if stars in (1, 2, 3, 4, 5):
-                    result[f'stars_{stars}'] += 1
+        if is_answered:
+            answered += 1
 
-                if is_answered:
-                    answered += 1
+        if is_negative:
+            result['negative_total'] += 1
+            if not is_answered:
+                result['negative_unanswered'] += 1
 
-                if is_negative:
-                    result['negative_total'] += 1
-                    if not is_answered:
-                        result['negative_unanswered'] += 1
-            except:
-                continue
+    unanswered = total - answered
+    result['answered'] = answered
+    result['unanswered'] = unanswered
+    result['unanswered_pct'] = round((unanswered / total) * 100, 1)
+    result['negative_unanswered_pct'] = round(
+        (result['negative_unanswered'] / result['negative_total']) * 100, 1
+    ) if result['negative_total'] > 0 else 0
 
-        unanswered = total - answered
-        result['answered'] = answered
-        result['unanswered'] = unanswered
-        result['unanswered_pct'] = round((unanswered / total) * 100, 1) if total > 0 else 0
-        result['negative_unanswered_pct'] = round(
-            (result['negative_unanswered'] / result['negative_total']) * 100, 1
-        ) if result['negative_total'] > 0 else 0
+    return result
 
-    except Exception as e:
-        print(f"  ⚠️  Error counting reviews: {e}")
-        logging.error(f"Error counting reviews: {e}")
 
-    return result
+def apply_review_stats(item, review_stats, total_reviews):
+    """
+    Copy review stats into the place item and extrapolate them to the total
+    review count of the place.
+    """
+    item['reviews_loaded'] = review_stats['total_reviews_loaded']
+    item['reviews_answered'] = review_stats['answered']
+    item['reviews_unanswered'] = review_stats['unanswered']
+    item['reviews_unanswered_pct'] = review_stats['unanswered_pct']
+    item['negative_total'] = review_stats['negative_total']
+    item['negative_unanswered'] = review_stats['negative_unanswered']
+    item['negative_unanswered_pct'] = review_stats['negative_unanswered_pct']
+    for s in (5, 4, 3, 2, 1):
+        item[f'stars_{s}'] = review_stats[f'stars_{s}']
+
+    # Extrapolate to total reviews
+    loaded = review_stats['total_reviews_loaded']
+    if loaded > 0:
+        unanswered_ratio = review_stats['unanswered'] / loaded
+        neg_unanswered_ratio = review_stats['negative_unanswered'] / loaded
+        item['est_unanswered'] = round(unanswered_ratio * total_reviews)
+        item['est_negative_unanswered'] = round(neg_unanswered_ratio * total_reviews)
+        for s in (5, 4, 3, 2, 1):
+            ratio = review_stats[f'stars_{s}'] / loaded
+            item[f'est_stars_{s}'] = round(ratio * total_reviews)
+    else:
+        item['est_unanswered'] = review_stats['unanswered']
+        item['est_negative_unanswered'] = review_stats['negative_unanswered']
+        for s in (5, 4, 3, 2, 1):
+            item[f'est_stars_{s}'] = review_stats[f'stars_{s}']
 
 
 def open_reviews_tab(driver):
@@ -302,13 +528,7 @@ def open_reviews_tab(driver):
     Returns True if successful.
     """
     try:
-        tab_selectors = [
-            "button[aria-label*='Reviews']",
-            "button[aria-label*='review']",
-            "button.hh2c6[data-tab-index='1']",
-        ]
-
-        for sel in tab_selectors:
+        for sel in REVIEW_TAB_SELECTORS:
             try:
                 tab = driver.find_element(By.CSS_SELECTOR, sel)
                 tab.click()
@@ -377,6 +597,7 @@ def get_place_data(driver, url, max_retries=3, scrape_reviews=True, max_review_s
     for attempt in range(max_retries):
         try:
             driver.get(url)
+            discard_performance_log(driver)
 
             accept_google_consent(driver, timeout=3)
 
@@ -407,7 +628,7 @@ def get_place_data(driver, url, max_retries=3, scrape_reviews=True, max_review_s
             try:
                 rating_elem = driver.find_element(By.CSS_SELECTOR, 'div[role="img"][aria-label*="star"]')
                 aria = rating_elem.get_attribute('aria-label')
-                m = re.search(r'([\d.,]+)', aria)
+                m = RATING_RE.search(aria)
                 item['rating'] = m.group(1).replace(',', '.') if m else ''
             except:
                 item['rating'] = ''
@@ -417,14 +638,14 @@ def get_place_data(driver, url, max_retries=3, scrape_reviews=True, max_review_s
             try:
                 review_el = driver.find_element(By.CSS_SELECTOR, 'span[aria-label*="review"]')
                 aria = review_el.get_attribute('aria-label')
-                reviews_match = re.search(r'([\d,]+)', aria)
+                reviews_match = COUNT_RE.search(aria)
                 if reviews_match:
                     item['reviews'] = reviews_match.group(1).replace(',', '')
             except:
                 try:
                     review_el = driver.find_element(By.XPATH, '//button[contains(@aria-label, "review")]')
                     aria = review_el.get_attribute('aria-label')
-                    reviews_match = re.search(r'([\d,]+)', aria)
+                    reviews_match = COUNT_RE.search(aria)
                     if reviews_match:
                         item['reviews'] = reviews_match.group(1).replace(',', '')
                 except:
@@ -494,39 +715,33 @@ def get_place_data(driver, url, max_retries=3, scrape_reviews=True, max_review_s
                     else:
                         effective_scrolls = max_review_scrolls
 
+                    # Drop network events from the place page; only the review panel's XHRs count
+                    capture = None
+                    if getattr(driver, "capture_reviews", False):
+                        capture = new_review_capture()
+                        try:
+                            driver.get_log("performance")
+                        except Exception:
+                            capture = None
+
                     if open_reviews_tab(driver):
                         time.sleep(2)
-                        scroll_reviews(driver, max_scrolls=effective_scrolls)
+                        scroll_reviews(driver, max_scrolls=effective_scrolls, capture=capture,
+                                       expected_total=total_reviews)
 
+                        # The DOM count is one round-trip and always available; the XHR pairs
+                        # are only trusted if they carry star ratings and cover at least as many
+                        # reviews (the first page may be server-rendered, never seen as an XHR).
+                        xhr_reviews = capture['reviews'] if capture else None
                         review_stats = count_unanswered_reviews(driver)
-                        item['reviews_loaded'] = review_stats['total_reviews_loaded']
-                        item['reviews_answered'] = review_stats['answered']
-                        item['reviews_unanswered'] = review_stats['unanswered']
-                        item['reviews_unanswered_pct'] = review_stats['unanswered_pct']
-                        item['negative_total'] = review_stats['negative_total']
-                        item['negative_unanswered'] = review_stats['negative_unanswered']
-                        item['negative_unanswered_pct'] = review_stats['negative_unanswered_pct']
-                        item['stars_5'] = review_stats['stars_5']
-                        item['stars_4'] = review_stats['stars_4']
-                        item['stars_3'] = review_stats['stars_3']
-                        item['stars_2'] = review_stats['stars_2']
-                        item['stars_1'] = review_stats['stars_1']
-
-# Extrapolate to total reviews
-                        loaded = review_stats['total_reviews_loaded']
-                        if loaded > 0:
-                            unanswered_ratio = review_stats['unanswered'] / loaded
-                            neg_unanswered_ratio = review_stats['negative_unanswered'] / loaded
-                            item['est_unanswered'] = round(unanswered_ratio * total_reviews)
-                            item['est_negative_unanswered'] = round(neg_unanswered_ratio * total_reviews)
-                            for s in (5, 4, 3, 2, 1):
-                                ratio = review_stats[f'stars_{s}'] / loaded
-                                item[f'est_stars_{s}'] = round(ratio * total_reviews)
-                        else:
-                            item['est_unanswered'] = review_stats['unanswered']
-                            item['est_negative_unanswered'] = review_stats['negative_unanswered']
-                            for s in (5, 4, 3, 2, 1):
-                                item[f'est_stars_{s}'] = review_stats[f'stars_{s}']
+                        if xhr_reviews:
+                            if (review_pairs_usable(xhr_reviews)
+                                    and len(xhr_reviews) >= review_stats['total_reviews_loaded']):
+                                review_stats = count_unanswered_reviews(driver, reviews=xhr_reviews)
+                            else:
+                                print(f"  ⚠️  Review XHR data unusable ({len(xhr_reviews)} captured, "
+                                      f"{review_stats['total_reviews_loaded']} in DOM), using DOM counts")
+                        apply_review_stats(item, review_stats, total_reviews)
 
                         print(f"  📊 Reviews: {review_stats['total_reviews_loaded']} loaded, "
                               f"{review_stats['unanswered']} unanswered ({review_stats['unanswered_pct']}%), "
@@ -551,8 +766,10 @@ def get_place_data(driver, url, max_retries=3, scrape_reviews=True, max_review_s
             logging.error(f"Error processing {url} (attempt {attempt + 1}): {e}")
 
             if attempt < max_retries - 1:
-                print(f"  Retrying in 2 seconds...")
-                time.sleep(2)
+                # Exponential backoff with jitter, so parallel scrapers don't retry in lockstep
+                delay = RETRY_BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5)
+                print(f"  Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
 
     print(f"  Failed to process {url} after {max_retries} attempts")
     logging.error(f"All {max_retries} attempts failed for {url}")
@@ -7,6 +7,7 @@ information from their websites using Playwright browser automation.
 """
 
 import csv
+import json
 import re
 import time
 import logging
@@ -45,6 +46,10 @@ BROWSER_ARGS = [
     '--renderer-process-limit=2',
 ]
 
+SOCIAL_KEYS = ['email', 'email_raw', 'phone', 'whatsapp',
+               'facebook', 'instagram', 'linkedin', 'twitter', 'tiktok']
+SOCIAL_COLUMNS = ['scraped_' + k for k in SOCIAL_KEYS]
+
 BAD_DOMAIN_PATTERNS = [
     "gulfcar.com", "autocarni.com", "saulautosales.com",
     "tinyurl.com", "bit.ly", "t.co", "goo.gl",
@@ -415,16 +420,35 @@ class SocialMediaScraper:
     # ── CSV processing ─────────────────────────────────────────────────
 
     def detect_encoding(self, path: str) -> str:
+        """Detect file encoding, reusing a `.enc` sidecar if the file is unchanged."""
+        cache_path = Path(path + '.enc')
+        try:
+            st = Path(path).stat()
+            key = {'mtime': st.st_mtime, 'size': st.st_size}
+        except OSError:
+            key = None
+        if key and cache_path.exists():
+            try:
+                cached = json.loads(cache_path.read_text())
+                if cached.get('mtime') == key['mtime'] and cached.get('size') == key['size']:
+                    return cached['encoding']
+            except Exception:
+                pass
+
         try:
             with open(path, 'rb') as f:
                 r = chardet.detect(f.read())
             enc, conf = r['encoding'], r['confidence']
-            if enc is None or conf < 0.7: return 'utf-8-sig'
-            if enc.lower() in ['iso-8859-2', 'windows-1250']: return 'cp1250'
-            return enc
+            if enc is None or conf < 0.7: enc = 'utf-8-sig'
+            elif enc.lower() in ['iso-8859-2', 'windows-1250']: enc = 'cp1250'
         except Exception:
             return 'utf-8'
 
+        if key:
+            try: cache_path.write_text(json.dumps({**key, 'encoding': enc}))
+            except OSError: pass
+        return enc
+
     async def process_csv(self, input_file: str, output_file: str):
         context = None
         try:
@@ -470,9 +494,7 @@ class SocialMediaScraper:
             if 'website' not in df.columns:
                 logger.error("No 'website' column"); return
 
-            for col in ['scraped_email', 'scraped_email_raw', 'scraped_phone', 'scraped_whatsapp',
-                        'scraped_facebook', 'scraped_instagram', 'scraped_linkedin',
-                        'scraped_twitter', 'scraped_tiktok']:
+            for col in SOCIAL_COLUMNS:
                 if col not in df.columns: df[col] = ''
 
             # Register DF for emergency save on SIGTERM
@@ -544,15 +566,7 @@ class SocialMediaScraper:
                         try: await page.close()
                         except Exception: pass
 
-                df.at[index, 'scraped_email'] = social_data.get('email', '')
-                df.at[index, 'scraped_email_raw'] = social_data.get('email_raw', '')
-                df.at[index, 'scraped_phone'] = social_data.get('phone', '')
-                df.at[index, 'scraped_whatsapp'] = social_data.get('whatsapp', '')
-                df.at[index, 'scraped_facebook'] = social_data.get('facebook', '')
-                df.at[index, 'scraped_instagram'] = social_data.get('instagram', '')
-                df.at[index, 'scraped_linkedin'] = social_data.get('linkedin', '')
-                df.at[index, 'scraped_twitter'] = social_data.get('twitter', '')
-                df.at[index, 'scraped_tiktok'] = social_data.get('tiktok', '')
+                df.loc[index, SOCIAL_COLUMNS] = [social_data.get(k, '') for k in SOCIAL_KEYS]
 
                 # Context reset every 20 rows
                 if (index + 1) % 20 == 0:
@@ -64,6 +64,14 @@ def run_script(script_path: Path, cwd: Path, status_placeholder):
         status_placeholder.error(f"❌ {e}")
         return False
 
+def read_log_tail(path: Path, max_bytes: int = 5000) -> str:
+    """Csak a fájl végét olvassuk be, nem az egész logot."""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(max(0, size - max_bytes))
+        return f.read().decode("utf-8", errors="replace")
+
 # --- TABS ---
 tab1, tab2, tab3 = st.tabs(["🚀 Teljes Pipeline", "📊 Eredmények", "⚙️ Haladó"])
 
@@ -256,4 +264,4 @@ with tab3:
     for log in log_files:
         if log.exists():
             with st.expander(f"📄 {log.name}"):
-                st.code(log.read_text()[-5000:])  # utolsó 5000 karakter
+                st.code(read_log_tail(log))  # utolsó 5000 byte
@@ -7,21 +7,142 @@ Updated: now returns negative review stats + estimated totals.
 
 import sys
 import os
+import re
+import random
 import logging
+from contextlib import contextmanager
+from urllib.parse import unquote
+
+import requests
 
 # Add the GMaps scraper directory to path so we can import from it
 GMAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "20251105 GMaps Scraper")
 sys.path.insert(0, GMAPS_DIR)
 
-from get_place_data import create_driver, get_place_data
+from get_place_data import (
+    create_driver, get_place_data, apply_review_stats, parse_review_payload,
+    review_pairs_usable, review_stats_from_pairs, USER_AGENTS,
+)
 
 logger = logging.getLogger(__name__)
 
+# Maps reviews RPC: the same XHR the Maps UI fires while the review panel scrolls.
+# Browserless fast path; if the layout changes we fall back to Selenium.
+# Off by default: a cookieless search GET usually ends on the consent page or
+# an unresolved results page (Maps picks the single result client-side), so
+# the feature id is rarely found and every audit would pay for an extra fetch.
+# Enable with AUDIT_USE_RPC=true only after checking it resolves from the host.
+USE_REVIEWS_RPC = os.environ.get("AUDIT_USE_RPC", "false").lower() == "true"
+REVIEWS_RPC_URL = "https://www.google.com/maps/rpc/listugcposts"
+REVIEWS_RPC_PB = (
+    "!1m6!1s{feature_id}!6m4!4m1!1e1!4m1!1e3!2m2!1i{page_size}!2s{cursor}"
+    "!5m2!1s!7e81!8m5!1b1!2b1!3b1!5b1!7b1!11m0!13m1!1e1"
+)
+REVIEWS_RPC_PAGE_SIZE = 20
+REVIEWS_RPC_MAX_PAGES = 25
+FEATURE_ID_RE = re.compile(r"(0x[0-9a-f]{6,}:0x[0-9a-f]{6,})")
+
+
+def fetch_review_stats_rpc(search_url: str, max_pages: int = REVIEWS_RPC_MAX_PAGES) -> dict | None:
+    """
+    Collect review stats from the Maps reviews RPC without starting a browser.
+    Returns a dict shaped like count_unanswered_reviews(), or None if the
+    feature id or the payload could not be resolved.
+
+    The feature id is only taken from the final (redirected) URL: when the
+    search resolves to a single place, Maps redirects to that place's URL.
+    A search results page also embeds ids of other places, so it is never scanned.
+    """
+    reviews = []
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": random.choice(USER_AGENTS),
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    try:
+        resp = session.get(search_url, timeout=15)
+        m = FEATURE_ID_RE.search(unquote(resp.url))
+        if not m:
+            logger.info("RPC: search did not resolve to a single place, falling back to browser")
+            return None
+        feature_id = m.group(1)
+
+        cursor = ""
+        for _ in range(max_pages):
+            pb = REVIEWS_RPC_PB.format(feature_id=feature_id, page_size=REVIEWS_RPC_PAGE_SIZE, cursor=cursor)
+            r = session.get(
+                REVIEWS_RPC_URL,
+                params={"authuser": "0", "hl": "en", "gl": "us", "pb": pb},
+                timeout=15,
+            )
+            r.raise_for_status()
+            page, cursor = parse_review_payload(r.text)
+            reviews.extend(page)
+            if not page or not cursor:
+                break
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"RPC review fetch failed: {e}")
+        return None
+    finally:
+        session.close()
+
+    if not reviews:
+        return None
+    if not review_pairs_usable(reviews):
+        logger.warning(f"RPC: {len(reviews)} reviews but no star ratings parsed, falling back to browser")
+        return None
+    return review_stats_from_pairs(reviews)
+
+
+@contextmanager
+def fresh_driver():
+    """A new Chrome for a single audit, quit afterwards."""
+    driver = create_driver(capture_reviews=True)
+    try:
+        yield driver
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+def review_scroll_budget(review_count: int | None) -> int:
+    """Scrolls needed for ~review_count reviews (about 8 load per scroll)."""
+    if not review_count:
+        return 50
+    return max(10, min(80, review_count // 8 + 3))
+
 
-def run_single_place_audit(maps_url: str, place_id: str, place_name: str = "", place_address: str = "") -> dict | None:
+def empty_audit_result(place_name: str = "", rating=None) -> dict:
+    """Audit result for a place with no reviews, without scraping."""
+    result = dict.fromkeys((
+        'reviews_loaded', 'answered', 'unanswered', 'unanswered_pct',
+        'negative_total', 'negative_unanswered', 'negative_unanswered_pct',
+        'est_unanswered', 'est_negative_unanswered',
+        'stars_5', 'stars_4', 'stars_3', 'stars_2', 'stars_1',
+        'est_stars_5', 'est_stars_4', 'est_stars_3', 'est_stars_2', 'est_stars_1',
+        'total_reviews_on_page',
+    ), 0)
+    result['place_name'] = place_name
+    result['rating'] = rating if rating is not None else ''
+    return result
+
+
+def run_single_place_audit(
+    maps_url: str,
+    place_id: str,
+    place_name: str = "",
+    place_address: str = "",
+    place_rating: float | None = None,
+    place_review_count: int | None = None,
+    driver_lease=fresh_driver,
+) -> dict | None:
     """
     Run audit on a single Google Maps place.
-    Uses the same scraper logic as get_place_data.py which is proven to work.
+    Tries the reviews RPC first, then the get_place_data.py browser logic.
+    driver_lease is a context manager factory yielding a driver; it is only
+    entered on the browser fallback (the service passes a pooled lease).
 
     Returns dict with:
       reviews_loaded, answered, unanswered, unanswered_pct,
@@ -30,10 +151,7 @@ def run_single_place_audit(maps_url: str, place_id: str, place_name: str = "", p
       total_reviews_on_page, place_name, rating
     or None on failure.
     """
-    driver = None
     try:
-        driver = create_driver()
-
         if place_name and place_address:
             search_term = f"{place_name} {place_address}"
         elif place_name:
@@ -44,14 +162,32 @@ def run_single_place_audit(maps_url: str, place_id: str, place_name: str = "", p
         search_url = f"https://www.google.com/maps/search/{search_term.replace(' ', '+')}?hl=en"
         logger.info(f"Audit URL: {search_url}")
 
-        place_data = get_place_data(
-            driver,
-            search_url,
-            max_retries=2,
-            scrape_reviews=True,
-            max_review_scrolls=50,
-            min_reviews_for_analysis=0,
-        )
+        place_data = None
+        if USE_REVIEWS_RPC:
+            max_pages = REVIEWS_RPC_MAX_PAGES
+            if place_review_count:
+                max_pages = min(max_pages, place_review_count // REVIEWS_RPC_PAGE_SIZE + 1)
+            review_stats = fetch_review_stats_rpc(search_url, max_pages=max_pages)
+            if review_stats:
+                total_reviews = max(place_review_count or 0, review_stats['total_reviews_loaded'])
+                place_data = {
+                    'name': place_name,
+                    'rating': place_rating if place_rating is not None else '',
+                    'reviews': total_reviews,
+                }
+                apply_review_stats(place_data, review_stats, total_reviews)
+                logger.info(f"RPC audit: {review_stats['total_reviews_loaded']} reviews fetched without browser")
+
+        if place_data is None:
+            with driver_lease() as driver:
+                place_data = get_place_data(
+                    driver,
+                    search_url,
+                    max_retries=2,
+                    scrape_reviews=True,
+                    max_review_scrolls=review_scroll_budget(place_review_count),
+                    min_reviews_for_analysis=0,
+                )
 
         if not place_data or place_data == "BROWSER_CRASHED":
             logger.error(f"Scraper failed for {place_name}")
@@ -104,13 +240,6 @@ def run_single_place_audit(maps_url: str, place_id: str, place_name: str = "", p
         logger.error(f"Audit failed: {e}", exc_info=True)
         return None
 
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except:
-                pass
-
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
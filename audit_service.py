@@ -5,41 +5,99 @@ Receives audit requests from Supabase, scrapes review data, sends report email.
 Usage:
   uvicorn audit_service:app --host 0.0.0.0 --port 8000
 
+Optional speedups: pip install uvloop orjson. uvicorn's default --loop auto
+picks uvloop when it is installed; responses are serialized with orjson.
+
+With AUDIT_QUEUE_MODE=worker the webhook only acknowledges; pending rows are
+claimed and scraped by audit_worker.py (one or more separate processes).
+
+Claims stamp review_audit_requests.claimed_at, so the table needs:
+  alter table review_audit_requests add column if not exists claimed_at timestamptz;
+
 Endpoints:
   POST /audit  - Trigger audit for a place (called by Supabase webhook)
   GET  /health - Health check
 """
 
 import os
+import time
+import queue
+import random
+import functools
+import atexit
 import asyncio
 import logging
-from datetime import datetime
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Header
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 from typing import Optional
 
+import httpx
 import resend
-from supabase import create_client
+from jinja2 import Template
 
-from audit_scraper import run_single_place_audit
+from audit_scraper import run_single_place_audit, empty_audit_result, create_driver
+from driver_pool import DriverPool
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
 RESEND_API_KEY = os.environ.get("RESEND_API_KEY", "")
+GOOGLE_PLACES_API_KEY = os.environ.get("GOOGLE_PLACES_API_KEY", "")  # optional review-count probe
+PLACES_DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
 AUDIT_SECRET = os.environ.get("AUDIT_SECRET", "change-me-in-production")
 FROM_EMAIL = os.environ.get("FROM_EMAIL", "Review Manager <hello@spinix.so>")
+AUDIT_POOL_SIZE = int(os.environ.get("AUDIT_POOL_SIZE", "2"))
+AUDIT_QUEUE_MODE = os.environ.get("AUDIT_QUEUE_MODE", "inline")  # "inline" | "worker"
+AUDIT_CACHE_TTL = int(os.environ.get("AUDIT_CACHE_TTL", "86400"))  # 24h
+AUDIT_CACHE_MAX = 10_000
+AUDIT_CACHE_PURGE_INTERVAL = 600  # seconds between sweeps of expired cache entries
+AUDIT_CLAIM_TIMEOUT = int(os.environ.get("AUDIT_CLAIM_TIMEOUT", "1800"))  # processing longer = claimer died
+EMAIL_BATCH_WINDOW = 2   # seconds finished audits wait to share one Resend call
+EMAIL_BATCH_MAX = 100    # Resend batch endpoint limit
+EMAIL_SEND_CONCURRENCY = 10  # max Resend calls in flight
+STATUS_BATCH_WINDOW = 0.5  # seconds final status rows wait to share one upsert
+STATUS_BATCH_MAX = 25
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5   # seconds, doubled per attempt
+RETRY_MAX_DELAY = 30
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+RATE_LIMIT_STATUS = {429}  # rejected before processing: the only safe retry for non-idempotent calls
+
+# Log records go through a queue; a listener thread owns the file handler,
+# so logging in request handlers never blocks the event loop on disk writes.
+_log_queue = queue.SimpleQueue()
+_log_file_handler = logging.FileHandler("/home/hello/scraper/Scraper/audit_service.log")
+_log_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logging.basicConfig(
-    filename="/home/hello/scraper/Scraper/audit_service.log",
     level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Review Audit Service", version="2.0")
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+try:
+    import orjson  # noqa: F401 -- ORJSONResponse needs it at render time
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
+app = FastAPI(title="Review Audit Service", version="2.0", default_response_class=DefaultResponse)
 resend.api_key = RESEND_API_KEY
 
+# Dedicated threads for the blocking scrape, one per pooled driver, so audits
+# never queue behind (or starve) Starlette's default threadpool.
+audit_executor = ThreadPoolExecutor(max_workers=AUDIT_POOL_SIZE, thread_name_prefix="audit")
+# Audits past this limit wait here (before the Places probe) instead of piling up
+# on the executor or the driver pool.
+audit_slots = asyncio.Semaphore(AUDIT_POOL_SIZE)
+
 
 class AuditRequest(BaseModel):
     id: str
@@ -49,13 +107,278 @@ class AuditRequest(BaseModel):
     place_address: Optional[str] = ""
     place_rating: Optional[float] = None
     place_review_count: Optional[int] = None
+    # Set by claim_audit_request: the row is known to exist, so its status can be upserted
+    _claimed: bool = PrivateAttr(default=False)
+
+
+class WebhookRecord(BaseModel):
+    """The review_audit_requests columns we use; the rest of the row is ignored."""
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    email: str = ""
+    place_id: str = ""
+    place_name: str = ""
+    place_address: Optional[str] = ""
+    place_rating: Optional[float] = None
+    place_review_count: Optional[int] = None
+    status: Optional[str] = None
 
 
 class WebhookPayload(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     type: str = "INSERT"
-    table: str = "review_audit_requests"
-    record: dict = {}
-    old_record: Optional[dict] = None
+    record: WebhookRecord
+
+
+def _is_transient(exc: Exception, statuses=TRANSIENT_STATUS) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in statuses
+    if isinstance(exc, httpx.TransportError):
+        return statuses is TRANSIENT_STATUS
+    # resend.exceptions.ResendError carries the HTTP status as .code
+    return getattr(exc, "code", None) in statuses
+
+
+def retry_transient(fn=None, *, statuses=TRANSIENT_STATUS):
+    """
+    Retry an async call on 429/5xx/connection errors with exponential backoff
+    and jitter, so workers hitting the same outage don't retry in lockstep.
+    Calls that must not run twice pass statuses=RATE_LIMIT_STATUS: a 5xx or a
+    dropped connection may come after the request already took effect.
+    """
+    if fn is None:
+        return functools.partial(retry_transient, statuses=statuses)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        for attempt in range(RETRY_ATTEMPTS):
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                if attempt == RETRY_ATTEMPTS - 1 or not _is_transient(e, statuses):
+                    raise
+                delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning(f"{fn.__name__} failed ({e}), retry {attempt + 1} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+    return wrapper
+
+
+@app.on_event("startup")
+async def start_http_client():
+    """Async PostgREST client, so Supabase writes never block the event loop."""
+    app.state.http = httpx.AsyncClient(
+        base_url=f"{SUPABASE_URL}/rest/v1",
+        headers={
+            "apikey": SUPABASE_SERVICE_KEY,
+            "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+            "Prefer": "return=minimal",
+        },
+        limits=httpx.Limits(max_keepalive_connections=15, max_connections=30, keepalive_expiry=30),
+        timeout=15,
+    )
+    # Separate client: the Supabase one carries the service key in its default headers
+    app.state.places_http = httpx.AsyncClient(timeout=5)
+
+
+async def stop_http_client():
+    await app.state.http.aclose()
+    await app.state.places_http.aclose()
+
+
+async def get_review_count_cheap(place_id: str) -> int | None:
+    """
+    Total review count from Places Details (one small JSON call), or None if
+    the key is not configured or the lookup failed.
+    """
+    if not GOOGLE_PLACES_API_KEY:
+        return None
+    try:
+        resp = await app.state.places_http.get(
+            PLACES_DETAILS_URL,
+            params={"place_id": place_id, "fields": "user_ratings_total", "key": GOOGLE_PLACES_API_KEY},
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        if data.get("status") != "OK":
+            logger.warning(f"Places probe for {place_id}: {data.get('status')}")
+            return None
+        return int(data.get("result", {}).get("user_ratings_total", 0) or 0)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"Places probe failed for {place_id}: {e}")
+        return None
+
+
+@retry_transient
+async def update_audit_request(req_id: str, fields: dict):
+    resp = await app.state.http.patch(
+        "/review_audit_requests",
+        params={"id": f"eq.{req_id}"},
+        json=fields,
+    )
+    resp.raise_for_status()
+
+
+# Not retried: if a claim commits but its response is lost, a retry would see
+# the row as already claimed and leave it stuck in processing.
+async def claim_audit_request(req: AuditRequest) -> bool:
+    """Atomically move a row pending -> processing. False if it was already claimed."""
+    resp = await app.state.http.patch(
+        "/review_audit_requests",
+        params={"id": f"eq.{req.id}", "status": "eq.pending"},
+        json={"status": "processing", "claimed_at": datetime.utcnow().isoformat()},
+        headers={"Prefer": "return=representation"},
+    )
+    resp.raise_for_status()
+    req._claimed = bool(resp.json())
+    return req._claimed
+
+
+async def release_stale_claims() -> int:
+    """
+    Put rows stuck in processing for over AUDIT_CLAIM_TIMEOUT (their worker
+    died mid-audit) back to pending. Returns how many were released.
+    """
+    cutoff = (datetime.utcnow() - timedelta(seconds=AUDIT_CLAIM_TIMEOUT)).isoformat()
+    resp = await app.state.http.patch(
+        "/review_audit_requests",
+        params={"status": "eq.processing", "claimed_at": f"lt.{cutoff}", "select": "id"},
+        json={"status": "pending"},
+        headers={"Prefer": "return=representation"},
+    )
+    resp.raise_for_status()
+    return len(resp.json())
+
+
+@retry_transient
+async def upsert_audit_requests(rows: list[dict]):
+    resp = await app.state.http.post(
+        "/review_audit_requests",
+        params={"on_conflict": "id"},
+        json=rows,
+        headers={"Prefer": "resolution=merge-duplicates,return=minimal"},
+    )
+    resp.raise_for_status()
+
+
+# Final (completed/failed) rows from audits that finish close together are
+# written with one upsert instead of one PATCH each. Only claimed rows go
+# through the upsert: they are known to exist, so it never inserts a new row.
+# Items are (row, future); the future resolves to whether the row was saved.
+_status_updates = asyncio.Queue()
+
+
+async def save_audit_status(req: AuditRequest, fields: dict) -> bool:
+    """Write final status fields; True once saved. Unclaimed requests (/audit/manual) get a plain PATCH."""
+    if not req._claimed:
+        try:
+            await update_audit_request(req.id, fields)
+            return True
+        except Exception as e:
+            logger.error(f"Could not save status for {req.id}: {e}")
+            return False
+
+    saved = asyncio.get_event_loop().create_future()
+    # The upsert may take the INSERT path's NOT NULL checks, so carry the row's identity
+    _status_updates.put_nowait(({
+        "id": req.id,
+        "email": req.email,
+        "place_id": req.place_id,
+        "place_name": req.place_name,
+        **fields,
+    }, saved))
+    return await saved
+
+
+async def flush_status_updates(items: list[tuple[dict, asyncio.Future]]):
+    latest = {}
+    waiters = {}
+    for row, saved in items:
+        latest.setdefault(row["id"], {}).update(row)
+        waiters.setdefault(row["id"], []).append(saved)
+
+    # PostgREST bulk upserts need every object to have the same keys
+    groups = {}
+    for row in latest.values():
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+
+    for group in groups.values():
+        try:
+            await upsert_audit_requests(group)
+            ok = {row["id"] for row in group}
+            logger.info(f"Saved {len(group)} audit status row(s) in one upsert")
+        except Exception as e:
+            logger.error(f"Status upsert failed ({len(group)} rows), updating one by one: {e}")
+            ok = set()
+            for row in group:
+                fields = {k: v for k, v in row.items() if k not in ("id", "email", "place_id", "place_name")}
+                try:
+                    await update_audit_request(row["id"], fields)
+                    ok.add(row["id"])
+                except Exception as e:
+                    logger.error(f"Could not save status for {row['id']}: {e}")
+        for row in group:
+            for saved in waiters[row["id"]]:
+                if not saved.done():
+                    saved.set_result(row["id"] in ok)
+
+
+async def _status_flusher():
+    loop = asyncio.get_event_loop()
+    while True:
+        items = [await _status_updates.get()]
+        deadline = loop.time() + STATUS_BATCH_WINDOW
+        while len(items) < STATUS_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(_status_updates.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await flush_status_updates(items)
+        finally:
+            for _, saved in items:
+                if not saved.done():
+                    saved.set_result(False)
+                _status_updates.task_done()
+
+
+@app.on_event("startup")
+async def start_status_flusher():
+    app.state.status_flusher = asyncio.create_task(_status_flusher())
+
+
+@app.on_event("shutdown")
+async def stop_status_flusher():
+    try:
+        await asyncio.wait_for(_status_updates.join(), timeout=30)
+    except asyncio.TimeoutError:
+        logger.error(f"{_status_updates.qsize()} audit status rows not saved at shutdown")
+    app.state.status_flusher.cancel()
+
+
+@app.on_event("startup")
+async def start_driver_pool(prewarm: bool = AUDIT_QUEUE_MODE != "worker"):
+    """
+    AUDIT_POOL_SIZE Chromium instances shared by all audits. In worker mode the
+    API only scrapes for /audit/manual, so its drivers are created on first use;
+    audit_worker.py passes prewarm=True.
+    """
+    app.state.driver_pool = DriverPool(functools.partial(create_driver, capture_reviews=True), AUDIT_POOL_SIZE)
+    await app.state.driver_pool.start(prewarm=prewarm)
+
+
+@app.on_event("shutdown")
+async def stop_driver_pool():
+    audit_executor.shutdown(wait=False)
+    await app.state.driver_pool.stop()
+
+
+def audit_request_from_record(record: WebhookRecord) -> AuditRequest:
+    return AuditRequest(**record.model_dump(exclude={"status"}))
 
 
 @app.get("/health")
@@ -73,25 +396,23 @@ async def trigger_audit(
         raise HTTPException(status_code=401, detail="Unauthorized")
 
     record = payload.record
-    if not record.get("email") or not record.get("place_id"):
+    if not record.email or not record.place_id:
         raise HTTPException(status_code=400, detail="Missing email or place_id")
 
-    if record.get("status") != "pending":
+    if record.status != "pending":
         return {"status": "skipped", "reason": "not pending"}
 
-    audit_req = AuditRequest(
-        id=record["id"],
-        email=record["email"],
-        place_id=record["place_id"],
-        place_name=record.get("place_name", ""),
-        place_address=record.get("place_address", ""),
-        place_rating=record.get("place_rating"),
-        place_review_count=record.get("place_review_count"),
-    )
+    audit_req = audit_request_from_record(record)
 
-    supabase.table("review_audit_requests").update(
-        {"status": "processing"}
-    ).eq("id", audit_req.id).execute()
+    if AUDIT_QUEUE_MODE == "worker":
+        # Row stays pending; audit_worker.py claims it
+        logger.info(f"Audit left for worker: {audit_req.place_name} ({audit_req.place_id})")
+        return {"status": "queued", "place": audit_req.place_name}
+
+    # Supabase retries webhooks on timeout: only the call that wins the claim runs the audit
+    if not await claim_audit_request(audit_req):
+        logger.info(f"Audit already claimed, skipping duplicate webhook: {audit_req.id}")
+        return {"status": "skipped", "reason": "already claimed"}
 
     background_tasks.add_task(process_audit, audit_req)
 
@@ -112,26 +433,108 @@ async def trigger_audit_manual(
     return {"status": "queued", "place": req.place_name}
 
 
-async def process_audit(req: AuditRequest):
-    try:
-        logger.info(f"Starting audit: {req.place_name} for {req.email}")
+# place_id -> (fetched_at, result); repeat audits of a place within the TTL skip the scrape.
+# Entries are re-inserted on refresh, so iteration order is oldest first.
+_audit_cache = {}
+# place_id -> Future of the scrape in flight, so concurrent audits of one place share it
+_audit_inflight = {}
+
 
+async def scrape_place(req: AuditRequest) -> dict | None:
+    async with audit_slots:
+        review_count = await get_review_count_cheap(req.place_id)
+        if review_count == 0:
+            logger.info(f"No reviews for {req.place_name}, skipping the browser")
+            return empty_audit_result(req.place_name, req.place_rating)
+        if review_count is not None:
+            req.place_review_count = review_count
+
+        # The driver is leased only if the browserless RPC path falls through
         loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None,
+        return await loop.run_in_executor(
+            audit_executor,
             run_single_place_audit,
             "",
             req.place_id,
             req.place_name,
             req.place_address,
+            req.place_rating,
+            req.place_review_count,
+            functools.partial(app.state.driver_pool.lease, loop),
         )
 
+
+async def get_audit_result(req: AuditRequest) -> dict | None:
+    now = time.monotonic()
+    cached = _audit_cache.get(req.place_id)
+    if cached and now - cached[0] < AUDIT_CACHE_TTL:
+        logger.info(f"Audit cache hit: {req.place_name} ({req.place_id})")
+        return cached[1]
+
+    inflight = _audit_inflight.get(req.place_id)
+    if inflight:
+        logger.info(f"Audit already running for {req.place_id}, waiting for it")
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_event_loop().create_future()
+    _audit_inflight[req.place_id] = future
+    result = None
+    try:
+        result = await scrape_place(req)
+        if result:
+            _audit_cache.pop(req.place_id, None)
+            _audit_cache[req.place_id] = (time.monotonic(), result)
+            while len(_audit_cache) > AUDIT_CACHE_MAX:
+                del _audit_cache[next(iter(_audit_cache))]
+        return result
+    finally:
+        future.set_result(result)
+        del _audit_inflight[req.place_id]
+
+
+def purge_audit_cache():
+    now = time.monotonic()
+    expired = 0
+    for key, (fetched_at, _) in list(_audit_cache.items()):
+        if now - fetched_at < AUDIT_CACHE_TTL:
+            break  # oldest first: the rest are fresh
+        del _audit_cache[key]
+        expired += 1
+    if expired:
+        logger.info(f"Audit cache: dropped {expired} expired entries, {len(_audit_cache)} left")
+
+
+async def _audit_cache_purger():
+    while True:
+        await asyncio.sleep(AUDIT_CACHE_PURGE_INTERVAL)
+        purge_audit_cache()
+
+
+@app.on_event("startup")
+async def start_cache_purger():
+    app.state.cache_purger = asyncio.create_task(_audit_cache_purger())
+
+
+@app.on_event("shutdown")
+async def stop_cache_purger():
+    app.state.cache_purger.cancel()
+
+
+async def process_audit(req: AuditRequest, mark_failed: bool = True) -> bool:
+    """
+    Run one audit end to end. Returns False on failure; the row is set to
+    failed only if mark_failed (the worker passes False while it can still retry).
+    """
+    try:
+        logger.info(f"Starting audit: {req.place_name} for {req.email}")
+
+        result = await get_audit_result(req)
+
         if not result:
             logger.error(f"Scraper returned no result for {req.place_name}")
-            supabase.table("review_audit_requests").update(
-                {"status": "failed"}
-            ).eq("id", req.id).execute()
-            return
+            if mark_failed:
+                await save_audit_status(req, {"status": "failed"})
+            return False
 
         logger.info(
             f"Audit complete: {req.place_name} - "
@@ -141,7 +544,7 @@ async def process_audit(req: AuditRequest):
         )
 
         # Store all results including negative review data and star distribution
-        supabase.table("review_audit_requests").update({
+        saved = await save_audit_status(req, {
             "status": "completed",
             "reviews_loaded": result["reviews_loaded"],
             "reviews_answered": result["answered"],
@@ -158,23 +561,37 @@ async def process_audit(req: AuditRequest):
             "stars_2": result.get("est_stars_2", 0),
             "stars_1": result.get("est_stars_1", 0),
             "completed_at": datetime.utcnow().isoformat(),
-        }).eq("id", req.id).execute()
+        })
+        if not saved:
+            # No email for a row that isn't completed; the worker retries (the scrape is cached)
+            logger.error(f"Could not save audit result for {req.place_name}")
+            if mark_failed:
+                await save_audit_status(req, {"status": "failed"})
+            return False
 
-        send_audit_email(req, result)
+        # Email isn't needed for the row to be complete; don't hold the audit on Resend
+        schedule_audit_email(req, result)
 
-        logger.info(f"Audit email sent to {req.email} for {req.place_name}")
+        logger.info(f"Audit email queued to {req.email} for {req.place_name}")
+        return True
 
     except Exception as e:
         logger.error(f"Audit failed for {req.place_name}: {e}", exc_info=True)
-        try:
-            supabase.table("review_audit_requests").update(
-                {"status": "failed"}
-            ).eq("id", req.id).execute()
-        except:
-            pass
+        if mark_failed:
+            await save_audit_status(req, {"status": "failed"})
+        return False
+
+
+STAR_COLORS = {5: "#10b981", 4: "#84cc16", 3: "#eab308", 2: "#f97316", 1: "#ef4444"}
+
+# Compiled once at import; autoescape keeps place names/addresses from breaking the HTML
+AUDIT_EMAIL_TEMPLATE = Template(
+    (Path(__file__).resolve().parent / "audit_email.html").read_text(encoding="utf-8"),
+    autoescape=True,
+)
 
 
-def send_audit_email(req: AuditRequest, result: dict):
+def build_audit_email(req: AuditRequest, result: dict) -> dict:
     total = result["reviews_loaded"]
     unanswered = result["unanswered"]
     answered = result["answered"]
@@ -188,172 +605,41 @@ def send_audit_email(req: AuditRequest, result: dict):
     rating = result.get("rating", req.place_rating or "N/A")
 
     # Star distribution (estimated to total)
-    est_s5 = result.get("est_stars_5", 0)
-    est_s4 = result.get("est_stars_4", 0)
-    est_s3 = result.get("est_stars_3", 0)
-    est_s2 = result.get("est_stars_2", 0)
-    est_s1 = result.get("est_stars_1", 0)
-    star_total = est_s5 + est_s4 + est_s3 + est_s2 + est_s1
-    star_max = max(est_s5, est_s4, est_s3, est_s2, est_s1, 1)
+    star_counts = {s: result.get(f"est_stars_{s}", 0) for s in (5, 4, 3, 2, 1)}
+    star_total = sum(star_counts.values())
+    star_max = max(*star_counts.values(), 1)
+    star_rows = [
+        {"stars": s, "color": STAR_COLORS[s], "count": star_counts[s],
+         "width": round(star_counts[s] / star_max * 100)}
+        for s in (5, 4, 3, 2, 1)
+    ]
 
     # Severity color logic
     if unanswered_pct >= 50:
-        severity_color = "#dc2626"
-        severity_bg = "#fef2f2"
-        severity_border = "#fecaca"
-        severity_label = "Critical"
+        severity = {"color": "#dc2626", "bg": "#fef2f2", "border": "#fecaca", "label": "Critical"}
     elif unanswered_pct >= 25:
-        severity_color = "#ea580c"
-        severity_bg = "#fff7ed"
-        severity_border = "#fed7aa"
-        severity_label = "Needs attention"
+        severity = {"color": "#ea580c", "bg": "#fff7ed", "border": "#fed7aa", "label": "Needs attention"}
     else:
-        severity_color = "#ca8a04"
-        severity_bg = "#fefce8"
-        severity_border = "#fef08a"
-        severity_label = "Room to improve"
-
-    html = f"""
-    <div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 600px; margin: 0 auto; padding: 20px; background: #ffffff;">
-
-      <!-- Header -->
-      <div style="text-align: center; margin-bottom: 30px;">
-        <div style="display: inline-block; background: #0f172a; border-radius: 12px; padding: 12px 24px; margin-bottom: 16px;">
-          <span style="color: #10b981; font-weight: 700; font-size: 18px;">SpiniX</span>
-          <span style="color: #94a3b8; font-size: 14px; margin-left: 8px;">Review Audit</span>
-        </div>
-        <h1 style="color: #1a1a2e; font-size: 22px; margin: 0 0 5px 0;">{req.place_name}</h1>
-        <p style="color: #999; font-size: 13px; margin: 0;">{req.place_address}</p>
-        {f'<p style="color: #666; font-size: 14px; margin: 8px 0 0 0;">⭐ {rating} ({total_on_page} reviews)</p>' if rating else ''}
-      </div>
-
-      <!-- Main stats -->
-      <div style="background: #f8f9fa; border-radius: 12px; padding: 24px; margin-bottom: 20px;">
-        <table width="100%" cellpadding="0" cellspacing="0" style="text-align: center;">
-          <tr>
-            <td style="padding: 8px;">
-              <div style="font-size: 32px; font-weight: 700; color: #1a1a2e;">{total}</div>
-              <div style="font-size: 11px; color: #666; margin-top: 4px; text-transform: uppercase; letter-spacing: 0.5px;">Analyzed</div>
-            </td>
-            <td style="padding: 8px;">
-              <div style="font-size: 32px; font-weight: 700; color: #10b981;">{answered}</div>
-              <div style="font-size: 11px; color: #666; margin-top: 4px; text-transform: uppercase; letter-spacing: 0.5px;">Answered</div>
-            </td>
-            <td style="padding: 8px;">
-              <div style="font-size: 32px; font-weight: 700; color: #ef4444;">{unanswered}</div>
-              <div style="font-size: 11px; color: #666; margin-top: 4px; text-transform: uppercase; letter-spacing: 0.5px;">Unanswered</div>
-            </td>
-          </tr>
-        </table>
-      </div>
-
-      <!-- Star distribution -->
-      {"" if star_total == 0 else f'''
-      <div style="background: #f8f9fa; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
-        <p style="color: #1a1a2e; font-weight: 600; margin: 0 0 14px 0; font-size: 14px;">Rating distribution (estimated)</p>
-        <table width="100%" cellpadding="0" cellspacing="0" style="font-size: 13px; color: #444;">
-          <tr>
-            <td style="padding: 4px 8px 4px 0; width: 30px; text-align: right;">5★</td>
-            <td style="padding: 4px 0;"><div style="background: #e5e7eb; border-radius: 4px; height: 16px; width: 100%;"><div style="background: #10b981; border-radius: 4px; height: 16px; width: {round(est_s5/star_max*100)}%;"></div></div></td>
-            <td style="padding: 4px 0 4px 8px; width: 40px; text-align: right; font-weight: 600;">{est_s5}</td>
-          </tr>
-          <tr>
-            <td style="padding: 4px 8px 4px 0; width: 30px; text-align: right;">4★</td>
-            <td style="padding: 4px 0;"><div style="background: #e5e7eb; border-radius: 4px; height: 16px; width: 100%;"><div style="background: #84cc16; border-radius: 4px; height: 16px; width: {round(est_s4/star_max*100)}%;"></div></div></td>
-            <td style="padding: 4px 0 4px 8px; width: 40px; text-align: right; font-weight: 600;">{est_s4}</td>
-          </tr>
-          <tr>
-            <td style="padding: 4px 8px 4px 0; width: 30px; text-align: right;">3★</td>
-            <td style="padding: 4px 0;"><div style="background: #e5e7eb; border-radius: 4px; height: 16px; width: 100%;"><div style="background: #eab308; border-radius: 4px; height: 16px; width: {round(est_s3/star_max*100)}%;"></div></div></td>
-            <td style="padding: 4px 0 4px 8px; width: 40px; text-align: right; font-weight: 600;">{est_s3}</td>
-          </tr>
-          <tr>
-            <td style="padding: 4px 8px 4px 0; width: 30px; text-align: right;">2★</td>
-            <td style="padding: 4px 0;"><div style="background: #e5e7eb; border-radius: 4px; height: 16px; width: 100%;"><div style="background: #f97316; border-radius: 4px; height: 16px; width: {round(est_s2/star_max*100)}%;"></div></div></td>
-            <td style="padding: 4px 0 4px 8px; width: 40px; text-align: right; font-weight: 600;">{est_s2}</td>
-          </tr>
-          <tr>
-            <td style="padding: 4px 8px 4px 0; width: 30px; text-align: right;">1★</td>
-            <td style="padding: 4px 0;"><div style="background: #e5e7eb; border-radius: 4px; height: 16px; width: 100%;"><div style="background: #ef4444; border-radius: 4px; height: 16px; width: {round(est_s1/star_max*100)}%;"></div></div></td>
-            <td style="padding: 4px 0 4px 8px; width: 40px; text-align: right; font-weight: 600;">{est_s1}</td>
-          </tr>
-        </table>
-      </div>
-      '''}
-
-      <!-- Unanswered alert -->
-      <div style="background: {severity_bg}; border: 1px solid {severity_border}; border-radius: 12px; padding: 20px; margin-bottom: 16px;">
-        <p style="color: {severity_color}; font-weight: 600; margin: 0 0 4px 0; font-size: 15px;">
-          {unanswered_pct}% of reviews have no reply
-        </p>
-        <p style="color: #666; margin: 0; font-size: 13px;">
-          {severity_label}
-          {f' — estimated {est_unanswered} unanswered across all {total_on_page} reviews' if est_unanswered > unanswered else ''}
-        </p>
-      </div>
-
-      <!-- Negative review alert -->
-      {"" if negative_total == 0 else f'''
-      <div style="background: #fef2f2; border: 1px solid #fecaca; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
-        <table width="100%" cellpadding="0" cellspacing="0">
-          <tr>
-            <td style="vertical-align: top; padding-right: 16px;">
-              <span style="font-size: 28px;">⚠️</span>
-            </td>
-            <td>
-              <p style="color: #dc2626; font-weight: 600; margin: 0 0 6px 0; font-size: 15px;">
-                {negative_unanswered} of {negative_total} negative reviews have no reply
-              </p>
-              <p style="color: #666; margin: 0; font-size: 13px; line-height: 1.5;">
-                Unanswered 1-2 star reviews are the #1 reason potential guests choose a competitor.
-                {"" if negative_unanswered_pct < 50 else " More than half of your negative reviews are sitting unanswered right now."}
-                {f" That could mean ~{est_negative} negative reviews without a response across your full review history." if est_negative > negative_unanswered else ""}
-              </p>
-            </td>
-          </tr>
-        </table>
-      </div>
-      '''}
-
-      <!-- What this means -->
-      <div style="background: #f0f9ff; border: 1px solid #bae6fd; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
-        <p style="color: #0369a1; font-weight: 600; margin: 0 0 8px 0; font-size: 15px;">
-          What this means for your business
-        </p>
-        <p style="color: #555; margin: 0; font-size: 13px; line-height: 1.6;">
-          Google prioritizes businesses that respond to reviews.
-          Responding to just your negative reviews alone could improve your visibility in local search results.
-          Guests who see owner replies are 1.7x more likely to visit.
-        </p>
-      </div>
-
-      <!-- CTA -->
-      <div style="background: #ecfdf5; border: 1px solid #a7f3d0; border-radius: 12px; padding: 24px; margin-bottom: 20px; text-align: center;">
-        <p style="color: #059669; font-weight: 600; margin: 0 0 8px 0; font-size: 16px;">
-          We'll draft replies to your first 10 reviews for free
-        </p>
-        <p style="color: #666; margin: 0 0 20px 0; font-size: 13px; line-height: 1.5;">
-          AI drafts in your tone and language. You approve each one before it goes live.<br>
-          No commitment. No credit card.
-        </p>
-        <a href="https://spinix.so/review-manager?utm_source=audit&utm_medium=email&utm_campaign=lead_magnet"
-           style="display: inline-block; background: #10b981; color: white; padding: 14px 32px;
-                  border-radius: 8px; text-decoration: none; font-weight: 600; font-size: 14px;">
-          Start for free →
-        </a>
-      </div>
-
-      <!-- Footer -->
-      <div style="text-align: center; padding-top: 20px; border-top: 1px solid #eee;">
-        <p style="color: #999; font-size: 11px; margin: 0;">
-          Sent by <a href="https://spinix.so" style="color: #10b981; text-decoration: none;">SpiniX</a> Review Manager
-        </p>
-        <p style="color: #bbb; font-size: 10px; margin: 8px 0 0 0;">
-          This is a one-time audit report you requested. No further emails will be sent.
-        </p>
-      </div>
-    </div>
-    """
+        severity = {"color": "#ca8a04", "bg": "#fefce8", "border": "#fef08a", "label": "Room to improve"}
+
+    html = AUDIT_EMAIL_TEMPLATE.render(
+        place_name=req.place_name,
+        place_address=req.place_address,
+        rating=rating,
+        total_on_page=total_on_page,
+        total=total,
+        answered=answered,
+        unanswered=unanswered,
+        unanswered_pct=unanswered_pct,
+        star_total=star_total,
+        star_rows=star_rows,
+        severity=severity,
+        est_unanswered=est_unanswered,
+        negative_total=negative_total,
+        negative_unanswered=negative_unanswered,
+        negative_unanswered_pct=negative_unanswered_pct,
+        est_negative=est_negative,
+    )
 
     subject = f"Review Audit: {req.place_name}"
     if negative_unanswered > 0:
@@ -361,9 +647,114 @@ def send_audit_email(req: AuditRequest, result: dict):
     elif unanswered > 0:
         subject += f" — {unanswered} unanswered reviews found"
 
-    resend.Emails.send({
+    return {
         "from": FROM_EMAIL,
         "to": [req.email],
         "subject": subject,
         "html": html,
-    })
+    }
+
+
+# Finished audits arrive in bursts (webhook storms); their emails are collected
+# for EMAIL_BATCH_WINDOW seconds and sent with one resend.Batch.send call.
+# Items are (request id, email params), so a failed send can be recorded on the row.
+_pending_emails: list[tuple[str, dict]] = []
+_email_lock = asyncio.Lock()
+_resend_sem = asyncio.Semaphore(EMAIL_SEND_CONCURRENCY)
+# Strong refs to fire-and-forget email tasks (the loop only keeps weak ones)
+_email_tasks = set()
+
+
+def schedule_audit_email(req: AuditRequest, result: dict):
+    task = asyncio.create_task(queue_audit_email(req, result))
+    _email_tasks.add(task)
+    task.add_done_callback(_email_tasks.discard)
+
+
+async def queue_audit_email(req: AuditRequest, result: dict):
+    try:
+        params = await asyncio.to_thread(build_audit_email, req, result)
+    except Exception as e:
+        logger.error(f"Could not build audit email for {req.place_name}: {e}", exc_info=True)
+        await mark_email_failed(req.id)
+        return
+    async with _email_lock:
+        _pending_emails.append((req.id, params))
+        full = len(_pending_emails) >= EMAIL_BATCH_MAX
+    if full:
+        await flush_audit_emails()
+
+
+async def flush_audit_emails():
+    async with _email_lock:
+        batch = _pending_emails[:EMAIL_BATCH_MAX]
+        del _pending_emails[:EMAIL_BATCH_MAX]
+    if not batch:
+        return
+    try:
+        async with _resend_sem:
+            await send_email_batch([params for _, params in batch])
+        logger.info(f"Sent {len(batch)} audit email(s) in one batch")
+        return
+    except Exception as e:
+        error = e
+
+    if not str(getattr(error, "code", "")).startswith("4"):
+        # 5xx / connection error: some emails may have gone out, resending could duplicate them
+        logger.error(f"Audit email batch failed ({len(batch)} emails): {error}", exc_info=True)
+        for req_id, _ in batch:
+            await mark_email_failed(req_id)
+        return
+
+    # 4xx: Resend rejected the whole batch (e.g. one bad address), nothing was sent
+    logger.warning(f"Audit email batch rejected ({len(batch)} emails), sending one by one: {error}")
+    for req_id, params in batch:
+        try:
+            async with _resend_sem:
+                await send_email(params)
+        except Exception as e:
+            logger.error(f"Audit email to {params['to']} failed: {e}")
+            await mark_email_failed(req_id)
+
+
+@retry_transient(statuses=RATE_LIMIT_STATUS)
+async def send_email_batch(batch: list[dict]):
+    await asyncio.to_thread(resend.Batch.send, batch)
+
+
+@retry_transient(statuses=RATE_LIMIT_STATUS)
+async def send_email(params: dict):
+    await asyncio.to_thread(resend.Emails.send, params)
+
+
+async def mark_email_failed(req_id: str):
+    """The audit row is already completed; flag it so the report can be resent."""
+    try:
+        await update_audit_request(req_id, {"status": "email_failed"})
+    except Exception as e:
+        logger.error(f"Could not mark email failure for {req_id}: {e}")
+
+
+async def _email_flusher():
+    while True:
+        await asyncio.sleep(EMAIL_BATCH_WINDOW)
+        while _pending_emails:
+            await flush_audit_emails()
+
+
+@app.on_event("startup")
+async def start_email_flusher():
+    app.state.email_flusher = asyncio.create_task(_email_flusher())
+
+
+@app.on_event("shutdown")
+async def stop_email_flusher():
+    app.state.email_flusher.cancel()
+    if _email_tasks:
+        await asyncio.gather(*_email_tasks, return_exceptions=True)
+    while _pending_emails:
+        await flush_audit_emails()
+
+
+# Registered last so the shutdown flushes above can still write through it
+app.add_event_handler("shutdown", stop_http_client)
@@ -0,0 +1,181 @@
+"""
+Review Audit Worker — Supabase-table queue consumer
+Runs the audits that the webhook left pending (AUDIT_QUEUE_MODE=worker), so the
+API process only acknowledges webhooks and scraping scales with worker count.
+
+1. Polls review_audit_requests for status=pending rows (oldest first)
+2. Claims each row with a conditional pending -> processing PATCH (no collisions)
+3. Runs process_audit() with up to AUDIT_POOL_SIZE audits in parallel
+4. Retries a failed audit (backoff + jitter) before marking the row failed
+5. Marks rows that can't be audited (invalid/missing fields) failed, so they
+   don't block the head of the queue
+6. Every STALE_SWEEP_INTERVAL, puts rows left in processing by a dead worker
+   (claimed_at older than AUDIT_CLAIM_TIMEOUT) back to pending
+
+Usage:
+  AUDIT_QUEUE_MODE=worker python3 audit_worker.py --worker-id 1
+"""
+
+import os
+import sys
+import random
+import asyncio
+import fcntl
+import signal
+import logging
+import argparse
+
+log = logging.getLogger("audit_worker")
+
+POLL_INTERVAL = 5  # seconds between polls when idle
+AUDIT_MAX_ATTEMPTS = int(os.environ.get("AUDIT_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = 30  # seconds before the 2nd attempt, doubled after that
+STALE_SWEEP_INTERVAL = 300  # seconds between stale-claim sweeps
+
+
+def acquire_lock(worker_id):
+    """Prevent duplicate instances of the same worker via flock."""
+    lock_file = f"/tmp/audit_worker_w{worker_id}.lock"
+    lock_fd = open(lock_file, "w")
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        lock_fd.write(str(os.getpid()))
+        lock_fd.flush()
+        return lock_fd
+    except BlockingIOError:
+        print(f"Audit worker {worker_id} already running. Exiting.")
+        sys.exit(0)
+
+
+async def fetch_pending(svc, limit):
+    resp = await svc.app.state.http.get(
+        "/review_audit_requests",
+        params={
+            "status": "eq.pending",
+            "select": "*",
+            "order": "created_at",
+            "limit": str(limit),
+        },
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def reject_record(svc, record, reason, worker_id):
+    """Mark a pending row that can't be audited as failed; left pending it would be fetched forever."""
+    log.error(f"W{worker_id}: rejecting row {record.get('id')}: {reason}")
+    if not record.get("id"):
+        return
+    try:
+        await svc.update_audit_request(record["id"], {"status": "failed"})
+    except Exception as e:
+        log.warning(f"W{worker_id}: could not mark row {record['id']} failed: {e}")
+
+
+async def run_with_retries(svc, req, worker_id):
+    """Run an audit, retrying failures; only the last attempt marks the row failed."""
+    for attempt in range(1, AUDIT_MAX_ATTEMPTS + 1):
+        last = attempt == AUDIT_MAX_ATTEMPTS
+        if await svc.process_audit(req, mark_failed=last):
+            return
+        if not last:
+            delay = RETRY_BASE_DELAY * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            log.warning(f"W{worker_id}: audit {req.id} failed (attempt {attempt}/{AUDIT_MAX_ATTEMPTS}), "
+                        f"retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+
+
+async def run_worker(worker_id=1):
+    import audit_service as svc
+
+    await svc.start_http_client()
+    await svc.start_driver_pool(prewarm=True)
+    await svc.start_email_flusher()
+    await svc.start_status_flusher()
+    await svc.start_cache_purger()
+
+    shutdown = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, shutdown.set)
+
+    running = set()
+    last_sweep = None
+    log.info(f"=== Audit Worker {worker_id} START ({svc.AUDIT_POOL_SIZE} slots) ===")
+
+    try:
+        while not shutdown.is_set():
+            if last_sweep is None or loop.time() - last_sweep >= STALE_SWEEP_INTERVAL:
+                last_sweep = loop.time()
+                try:
+                    released = await svc.release_stale_claims()
+                    if released:
+                        log.info(f"W{worker_id}: released {released} stale processing rows")
+                except Exception as e:
+                    log.warning(f"W{worker_id}: stale-claim sweep failed: {e}")
+
+            free = svc.AUDIT_POOL_SIZE - len(running)
+            if free > 0:
+                try:
+                    rows = await fetch_pending(svc, free)
+                except Exception as e:
+                    log.warning(f"W{worker_id}: poll failed: {e}")
+                    rows = []
+
+                for record in rows:
+                    if not record.get("email") or not record.get("place_id"):
+                        await reject_record(svc, record, "missing email or place_id", worker_id)
+                        continue
+                    try:
+                        req = svc.audit_request_from_record(svc.WebhookRecord.model_validate(record))
+                    except Exception as e:
+                        await reject_record(svc, record, e, worker_id)
+                        continue
+                    try:
+                        if not await svc.claim_audit_request(req):
+                            continue  # another worker got it
+                    except Exception as e:
+                        log.warning(f"W{worker_id}: claim failed for {record['id']}: {e}")
+                        continue
+                    log.info(f"W{worker_id}: claimed {req.place_name} ({req.id})")
+                    task = asyncio.create_task(run_with_retries(svc, req, worker_id))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+
+            try:
+                await asyncio.wait_for(shutdown.wait(), timeout=POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+        if running:
+            log.info(f"W{worker_id}: shutdown, finishing {len(running)} running audits...")
+            await asyncio.gather(*running, return_exceptions=True)
+    finally:
+        await svc.stop_cache_purger()
+        await svc.stop_status_flusher()
+        await svc.stop_email_flusher()
+        await svc.stop_driver_pool()
+        await svc.stop_http_client()
+        log.info(f"=== Audit Worker {worker_id} END ===")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--worker-id", type=int, default=1, help="Worker ID")
+    args = parser.parse_args()
+
+    lock_fd = acquire_lock(args.worker_id)
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    asyncio.run(run_worker(worker_id=args.worker_id))
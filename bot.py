@@ -9,7 +9,7 @@ Commands:
   /show_categories              - show current categories.txt
 """
 
-import subprocess
+import asyncio
 import json
 import os
 import html
@@ -36,6 +36,22 @@ def is_allowed(update: Update) -> bool:
     return update.effective_chat.id == ALLOWED_CHAT_ID
 
 
+async def run_tmux(*args, capture=False):
+    """Run a tmux command without blocking the bot's event loop. Returns (returncode, stdout)."""
+    proc = await asyncio.create_subprocess_exec(
+        "tmux", *args,
+        stdout=asyncio.subprocess.PIPE if capture else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    stdout, _ = await proc.communicate()
+    return proc.returncode, (stdout or b"").decode("utf-8", errors="replace")
+
+
+async def tmux_session_running() -> bool:
+    returncode, _ = await run_tmux("has-session", "-t", TMUX_SESSION)
+    return returncode == 0
+
+
 async def cmd_locations(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_allowed(update):
         return
@@ -137,8 +153,7 @@ def build_config_keyboard(config: dict) -> InlineKeyboardMarkup:
 async def cmd_run(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_allowed(update):
         return
-    result = subprocess.run(["tmux", "has-session", "-t", TMUX_SESSION], capture_output=True)
-    if result.returncode == 0:
+    if await tmux_session_running():
         await update.message.reply_text("⚠️ Pipeline already running! Check with /status.")
         return
 
@@ -172,7 +187,7 @@ async def handle_run_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
         await query.edit_message_text(f"🚀 [{INSTANCE_NAME}] Pipeline started!\n{summary}")
 
         cmd = f"cd {SCRAPER_DIR} && git pull && source venv/bin/activate && python3 run_all.py"
-        subprocess.run(["tmux", "new-session", "-d", "-s", TMUX_SESSION, "bash", "-c", cmd])
+        await run_tmux("new-session", "-d", "-s", TMUX_SESSION, "bash", "-c", cmd)
         return
 
     if data == "cfg:all_on":
@@ -197,11 +212,10 @@ async def handle_run_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
 async def cmd_stop(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_allowed(update):
         return
-    result = subprocess.run(["tmux", "has-session", "-t", TMUX_SESSION], capture_output=True)
-    if result.returncode != 0:
+    if not await tmux_session_running():
         await update.message.reply_text("⚪ No pipeline running.")
         return
-    subprocess.run(["tmux", "send-keys", "-t", TMUX_SESSION, "C-c", ""])
+    await run_tmux("send-keys", "-t", TMUX_SESSION, "C-c", "")
     await update.message.reply_text(f"🛑 [{INSTANCE_NAME}] Stop signal sent.")
 
 
@@ -237,45 +251,40 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
             pass  # stale or unreadable PID file → fall through
 
     # 2) Legacy tmux launch path: tmux session created by /run command
-    result = subprocess.run(["tmux", "has-session", "-t", TMUX_SESSION], capture_output=True)
-    if result.returncode == 0:
-        log = subprocess.run(
-            ["tmux", "capture-pane", "-t", TMUX_SESSION, "-p", "-S", "-15"],
-            capture_output=True, text=True
-        )
-        lines = log.stdout.strip()
+    if await tmux_session_running():
+        _, pane = await run_tmux("capture-pane", "-t", TMUX_SESSION, "-p", "-S", "-15", capture=True)
+        lines = pane.strip()
         msg = f"🟢 [{INSTANCE_NAME}] Pipeline running (tmux mode).\n\n<pre>" + (lines[-3000:] if lines else "No log") + "</pre>"
         await update.message.reply_text(msg, parse_mode="HTML")
     else:
         await update.message.reply_text(f"⚪ [{INSTANCE_NAME}] No pipeline running.")
 
 
+async def show_file(update: Update, filepath: Path, icon: str):
+    """Reply with a small file inline, or upload it as a document if it won't fit in a message."""
+    try:
+        size = filepath.stat().st_size
+    except FileNotFoundError:
+        await update.message.reply_text(f"⚠️ {filepath.name} not found.")
+        return
+    if size > 4000:
+        data = await asyncio.to_thread(filepath.read_bytes)
+        await update.message.reply_document(document=data, filename=filepath.name, caption=f"{icon} {filepath.name}")
+    else:
+        content = (await asyncio.to_thread(filepath.read_text, encoding="utf-8")).strip()
+        await update.message.reply_text(f"{icon} {filepath.name}:\n{content}")
+
+
 async def cmd_show_locations(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_allowed(update):
         return
-    filepath = GMAPS_DIR / "locations.txt"
-    if filepath.exists():
-        content = filepath.read_text(encoding="utf-8").strip()
-        if len(content) > 4000:
-            await update.message.reply_document(document=open(filepath, "rb"), caption="📍 locations.txt")
-        else:
-            await update.message.reply_text(f"📍 locations.txt:\n{content}")
-    else:
-        await update.message.reply_text("⚠️ locations.txt not found.")
+    await show_file(update, GMAPS_DIR / "locations.txt", "📍")
 
 
 async def cmd_show_categories(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not is_allowed(update):
         return
-    filepath = GMAPS_DIR / "categories.txt"
-    if filepath.exists():
-        content = filepath.read_text(encoding="utf-8").strip()
-        if len(content) > 4000:
-            await update.message.reply_document(document=open(filepath, "rb"), caption="📂 categories.txt")
-        else:
-            await update.message.reply_text(f"📂 categories.txt:\n{content}")
-    else:
-        await update.message.reply_text("⚠️ categories.txt not found.")
+    await show_file(update, GMAPS_DIR / "categories.txt", "📂")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Pre-warmed Selenium driver pool for the audit service.
+
+Each audit checks a driver out and gives it back when done. On return the
+driver is reset (cookies cleared, about:blank) so audits don't leak state.
+It is replaced with a fresh Chrome after MAX_USES_PER_INSTANCE audits, or
+right away if the browser died.
+"""
+
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager, contextmanager
+
+logger = logging.getLogger(__name__)
+
+MAX_USES_PER_INSTANCE = int(os.environ.get("AUDIT_DRIVER_MAX_USES", "50"))
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    """asyncio.Queue of (driver, uses) slots; a slot's driver is None if creating it failed."""
+
+    def __init__(self, create_driver, size):
+        self.create_driver = create_driver
+        self.size = size
+        self._slots = asyncio.Queue(maxsize=size)
+
+    async def start(self, prewarm=True):
+        """Fill the slots; without prewarm, each driver is created on first use."""
+        loop = asyncio.get_event_loop()
+        for _ in range(self.size):
+            driver = None
+            if prewarm:
+                try:
+                    driver = await loop.run_in_executor(None, self.create_driver)
+                except Exception as e:
+                    logger.error(f"Driver pre-warm failed, will create on demand: {e}")
+            self._slots.put_nowait((driver, 0))
+        logger.info(f"Driver pool ready ({self.size} slots, {MAX_USES_PER_INSTANCE} uses per driver, "
+                    f"{'pre-warmed' if prewarm else 'lazy'})")
+
+    async def stop(self):
+        while not self._slots.empty():
+            driver, _ = self._slots.get_nowait()
+            if driver:
+                _quit(driver)
+
+    def _recycle(self, driver, uses):
+        """Reset a driver between audits; replace it if worn out or dead."""
+        if driver is None:
+            return self.create_driver(), 0
+        if uses >= MAX_USES_PER_INSTANCE:
+            logger.info(f"Driver reached {uses} uses, replacing it")
+            _quit(driver)
+            return self.create_driver(), 0
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return driver, uses
+        except Exception:
+            _quit(driver)
+            return self.create_driver(), 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        loop = asyncio.get_event_loop()
+        driver, uses = await self._slots.get()
+        try:
+            if driver is None:
+                driver = await loop.run_in_executor(None, self.create_driver)
+                uses = 0
+            yield driver
+        finally:
+            try:
+                driver, uses = await loop.run_in_executor(None, self._recycle, driver, uses + 1)
+            except Exception as e:
+                logger.error(f"Driver recycle failed: {e}")
+                driver, uses = None, 0
+            self._slots.put_nowait((driver, uses))
+
+    @contextmanager
+    def lease(self, loop):
+        """
+        acquire() for code running in an executor thread: blocks that thread
+        (not the event loop) until a driver is free, and returns it afterwards.
+        """
+        cm = self.acquire()
+        driver = asyncio.run_coroutine_threadsafe(cm.__aenter__(), loop).result()
+        try:
+            yield driver
+        finally:
+            asyncio.run_coroutine_threadsafe(cm.__aexit__(None, None, None), loop).result()
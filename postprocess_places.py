@@ -1,10 +1,14 @@
 import csv
+import os
 import re
 import sys
+from functools import lru_cache, partial
+from itertools import chain, islice
+from multiprocessing import Pool
 from pathlib import Path
 from urllib.parse import unquote
 
-PLACEHOLDER_DOMAINS = {
+PLACEHOLDER_DOMAINS = frozenset({
     "domain.com",
     "example.com",
     "test.com",
@@ -24,46 +28,81 @@ PLACEHOLDER_DOMAINS = {
     "szte.hu",
     "foodpanda.com",
     "grab.com",
-}
+})
 
 EMAIL_RE = re.compile(
     r"^[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}$",
     re.IGNORECASE,
 )
 
-PHONE_TOKEN_SPLIT_RE = re.compile(r"[,\s/]+")
+# Ekkora bemenet fölött (~100k sor) éri meg több processzre szétosztani
+PARALLEL_MIN_BYTES = 50 * 1024 * 1024
+PARALLEL_CHUNK_ROWS = 50_000
+# Nagyobb I/O puffer a bemeneti/kimeneti CSV-hez (alapértelmezés 8 KB)
+IO_BUFFER_BYTES = 1 << 20
 
+PHONE_TOKEN_SPLIT_RE = re.compile(r"[,\s/]+")
+PAREN_TAIL_RE = re.compile(r"\s*\(.*?\)\s*$")
+DIGIT_TOKEN_RE = re.compile(r"\b\d+\b")
+
+# is_valid_email karaktertáblák: local.strip(EMAIL_LOCAL_CHARS) == "" ↔ csak megengedett karakter
+DIGITS = "0123456789"
+EMAIL_DOMAIN_CHARS = "abcdefghijklmnopqrstuvwxyz" + DIGITS + ".-"
+EMAIL_LOCAL_CHARS = EMAIL_DOMAIN_CHARS + "_%+"
+# str.translate tábla: minden nem-számjegy ASCII karakter törlése
+ASCII_NONDIGIT_TABLE = {c: None for c in range(128) if not chr(c).isdigit()}
+# split_emails elválasztók: ";" és minden whitespace (ugyanaz, mint a regex \s) → ","
+# (a legnagyobb whitespace kódpont az U+3000, afölött nem kell keresni)
+EMAIL_SEP_TABLE = {c: "," for c in range(0x3001) if chr(c).isspace()}
+EMAIL_SEP_TABLE[ord(";")] = ","
+
+# Ha ezek bárhol szerepelnek az emailben → fájlnév, nem email
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".js", ".css", ".ts", ".jsx")
+# ".png" in email ↔ valamelyik pont utáni szakasz "png"-vel kezdődik (egy startswith szakaszonként)
+IMAGE_EXT_NAMES = tuple(ext[1:] for ext in IMAGE_EXTS)
+
+# email_priority táblák: a local part vége alapján (pl. "info@" → 10, "office@" → 5)
+BUSINESS_PREFIXES_HI = ("info", "contact", "hello", "sales")
+BUSINESS_PREFIXES_MID = ("admin", "office", "support", "business")
+PERSONAL_DOMAIN_RE = re.compile(r"gmail\.com|yahoo\.com|hotmail\.com|outlook\.com")
+
+@lru_cache(maxsize=8192)
 def email_priority(email: str) -> int:
     """Magasabb = jobb business email."""
     if not email:
         return -100
     
     lower = email.lower()
+    local = lower.partition("@")[0]
     
     # Business email prefixes (highest priority)
-    if any(p in lower for p in ['info@', 'contact@', 'hello@', 'sales@']):
+    if local.endswith(BUSINESS_PREFIXES_HI):
         return 10
     
     # Other business-like prefixes (medium priority)
-    if any(p in lower for p in ['admin@', 'office@', 'support@', 'business@']):
+    if local.endswith(BUSINESS_PREFIXES_MID):
         return 5
     
     # Personal email providers (lower priority)
-    if any(d in lower for d in ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com']):
+    if PERSONAL_DOMAIN_RE.search(lower):
         return -5
     
     # Default business domains get neutral score
     return 0
 
+@lru_cache(maxsize=65536)
 def simplify_name(name: str) -> str:
     if not name:
         return ""
     # Első rész " - " előtt
     base = name.split(" - ")[0].strip()
     # Zárójeles rész levágása a végéről
-    base = re.sub(r"\s*\(.*?\)\s*$", "", base).strip()
+    base = PAREN_TAIL_RE.sub("", base).strip()
+    # Tisztán ASCII név (a gyakori eset): nincs mit kidobni
+    if base.isascii():
+        return base or name.strip()
     # Minden nem-ASCII karakter kidobása (arab, kínai, stb.)
-    ascii_only = "".join(ch for ch in base if ord(ch) < 128).strip()
+    ascii_only = base.encode("ascii", "ignore").decode("ascii").strip()
     return ascii_only or base or name.strip()
 
 def clean_phone(phone: str) -> str:
@@ -85,7 +124,11 @@ def normalize_phone_token(token: str) -> str:
 
     # Tartsuk meg az elején a + jelet, az összes többi nem szám karaktert dobjuk
     has_plus = token.startswith("+")
-    digits = "".join(ch for ch in token if ch.isdigit())
+    if token.isascii():
+        digits = token.translate(ASCII_NONDIGIT_TABLE)
+    else:
+        # nem-ASCII: isdigit() más írásrendszerek számjegyeit is elfogadja
+        digits = "".join(ch for ch in token if ch.isdigit())
 
     if not digits:
         return ""
@@ -104,21 +147,17 @@ def normalize_phone_token(token: str) -> str:
         return "+" + digits
     return digits  # maradhat országkód nélkül is, ha nem volt + jel
 
+@lru_cache(maxsize=65536)
 def split_phones(raw: str):
     if not raw:
-        return []
+        return ()
     parts = PHONE_TOKEN_SPLIT_RE.split(raw)
-    seen = set()
-    result = []
-
-    for p in parts:
-        norm = normalize_phone_token(p)
-        if norm and norm not in seen:
-            seen.add(norm)
-            result.append(norm)
-
-    return result
+    # dict.fromkeys: sorrendtartó dedup, az üres (érvénytelen) tokeneket kiszűrve
+    normalized = dict.fromkeys(map(normalize_phone_token, parts))
+    normalized.pop("", None)
+    return tuple(normalized)
 
+@lru_cache(maxsize=65536)
 def extract_country(address: str, plus_code: str) -> str:
     parts_to_search = [address or "", plus_code or ""]
 
@@ -130,17 +169,17 @@ def extract_country(address: str, plus_code: str) -> str:
 
         # "Plus code: ..." elejét vágjuk le, ha van
         if cleaned.lower().startswith("plus code:"):
-            cleaned = cleaned.split(":", 1)[1].strip()
+            cleaned = cleaned.partition(":")[2].strip()
 
         # 1) vessző utáni utolsó rész
         if "," in cleaned:
-            candidate = cleaned.split(",")[-1].strip()
-            candidate = re.sub(r"\b\d+\b", "", candidate).strip()
+            candidate = cleaned.rpartition(",")[2].strip()
+            candidate = DIGIT_TOKEN_RE.sub("", candidate).strip()
 
             # ha még mindig hosszú, és van benne " - ", vegyük annak az utolsó részét
             if " - " in candidate:
-                sub = candidate.split(" - ")[-1].strip()
-                sub = re.sub(r"\b\d+\b", "", sub).strip()
+                sub = candidate.rpartition(" - ")[2].strip()
+                sub = DIGIT_TOKEN_RE.sub("", sub).strip()
                 if sub:
                     return sub
 
@@ -149,20 +188,23 @@ def extract_country(address: str, plus_code: str) -> str:
 
         # 2) ha nem volt vessző, próbáljuk közvetlenül a " - " utáni utolsó részt
         if " - " in cleaned:
-            candidate = cleaned.split(" - ")[-1].strip()
-            candidate = re.sub(r"\b\d+\b", "", candidate).strip()
+            candidate = cleaned.rpartition(" - ")[2].strip()
+            candidate = DIGIT_TOKEN_RE.sub("", candidate).strip()
             if candidate:
                 return candidate
 
     return ""
 
+@lru_cache(maxsize=65536)
 def clean_email_before_validation(email: str) -> str:
     """Email előtisztítás validáció előtt."""
     if not email:
         return ""
     
-    # URL decode FIRST, then strip
-    email = unquote(email).strip()
+    # URL decode FIRST, then strip (% nélkül nincs mit dekódolni)
+    if "%" in email:
+        email = unquote(email)
+    email = email.strip()
     
     # Query string levágás
     if "?" in email:
@@ -173,6 +215,7 @@ def clean_email_before_validation(email: str) -> str:
     
     return email
 
+@lru_cache(maxsize=65536)
 def is_valid_email(email: str) -> bool:
     if not email:
         return False
@@ -186,51 +229,48 @@ def is_valid_email(email: str) -> bool:
     
     lower = email.lower()
     
-    # 4. Képfájl pattern - BŐVÍTETT
-    # @2x, @3x retina képek kiszűrése
-    if re.search(r"@\d+x", lower):
-        return False
-    
-    # 5. Fájlkiterjesztés check - bárhol az emailben
-    image_exts = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".js", ".css", ".ts", ".jsx")
-    if any(ext in lower for ext in image_exts):
-        return False
-    
-    # 6. Útvonal jellegű
-    if "/" in lower:
-        return False
+    # Minden lépés csak elutasíthat, így a sorrend nem számít: az olcsó
+    # karakterkészlet-ellenőrzések (C-ben futó str.strip) mennek előre, regex nélkül.
     
     # 7. Nincs @ vagy több @ van
     if lower.count("@") != 1:
         return False
     
-    local, domain = lower.split("@")
+    local, _, domain = lower.partition("@")
     
-    # 8. Honeypot/spam trap patterns
-    if "sentry" in local:
+    # 10–11. Local / domain csak megengedett karakterekből (ez kizárja a "/"-t is, 6.)
+    if not local or local.strip(EMAIL_LOCAL_CHARS):
+        return False
+    if not domain or domain.strip(EMAIL_DOMAIN_CHARS):
         return False
     
-    # 9. Értelmetlen random stringek kiszűrése (pl. "wsentryer", "xyzabc")
-    # Ha a local part 6+ karakter és nincs benne magánhangzó → garbage
-    if len(local) >= 6:
-        vowels = set("aeiou")
-        if not any(c in vowels for c in local.replace(".", "")):
-            return False
+    # 12. Dupla pont a domainben
+    if ".." in domain:
+        return False
     
-    # 10. Local part validáció
-    if not local or not re.match(r"^[a-z0-9._%+-]+$", local):
+    # 13. Domain formátum - legalább egy pont, a végén 2+ betűs TLD
+    head, _, tld = domain.rpartition(".")
+    if not head or len(tld) < 2 or not tld.isalpha():
         return False
     
-    # 11. Domain validáció
-    if not domain:
+    # 4. Képfájl pattern - BŐVÍTETT
+    # @2x, @3x retina képek kiszűrése (@ után számjegyek, majd "x")
+    after_digits = domain.lstrip(DIGITS)
+    if len(after_digits) < len(domain) and after_digits.startswith("x"):
         return False
     
-    # 12. Dupla pont a domainben
-    if ".." in domain:
+    # 5. Fájlkiterjesztés check - bárhol az emailben
+    for segment in lower.split(".")[1:]:
+        if segment.startswith(IMAGE_EXT_NAMES):
+            return False
+    
+    # 8. Honeypot/spam trap patterns
+    if "sentry" in local:
         return False
     
-    # 13. Domain formátum - legalább egy pont, csak alnum és kötőjel
-    if not re.match(r"^[a-z0-9.-]+\.[a-z]{2,}$", domain):
+    # 9. Értelmetlen random stringek kiszűrése (pl. "wsentryer", "xyzabc")
+    # Ha a local part 6+ karakter és nincs benne magánhangzó → garbage
+    if len(local) >= 6 and not any(v in local for v in "aeiou"):
         return False
     
     # 14. Placeholder domain check
@@ -250,9 +290,9 @@ def split_emails(raw: str):
     if not raw:
         return []
     
-    # Egységesítés
-    tmp = re.sub(r"[;\s]+", ",", raw)
-    candidates = [p.strip() for p in tmp.split(",") if p.strip()]
+    # Egységesítés (a fordítás után nem marad whitespace, így strip sem kell)
+    tmp = raw.translate(EMAIL_SEP_TABLE)
+    candidates = [p for p in tmp.split(",") if p]
 
     seen = set()
     result = []
@@ -271,104 +311,176 @@ def split_emails(raw: str):
     result.sort(key=email_priority, reverse=True)
     return result
 
-def process(in_path: Path, out_path: Path):
+def _cell(row: list, col: dict, name: str) -> str:
+    """Cella érték oszlopnév alapján; hiányzó oszlopnál üres string."""
+    i = col.get(name)
+    return row[i] if i is not None else ""
+
+def transform_row(row: list, col: dict):
+    """
+    Egy sor tisztítása egy menetben (név, telefonok, ország, emailek).
+    A sor már a kimeneti oszloprendben van, col: oszlopnév → pozíció.
+    Visszaadja a sort és a prioritás szerint rendezett email listát;
+    a globális email dedup a hívó dolga.
+    """
+    # 1) egyszerűsített név
+    row[col["simple_name"]] = simplify_name(_cell(row, col, "name"))
+
+    # 2) phone tisztítás + validáció
+    phones = split_phones(row[col["phone"]])
+    row[col["phone"]] = phones[0] if phones else ""
+
+    # 3) ország cím / plus code alapján
+    row[col["country"]] = extract_country(_cell(row, col, "address"), _cell(row, col, "plus_code"))
+
+    # 4–5) email logika - ✅ TISZTÍTÁSSAL
+    scraped_email = clean_email_before_validation(row[col["scraped_email"]])
+    scraped_email_raw = _cell(row, col, "scraped_email_raw").strip()
+
+    # ha teljes egyezés, raw törlése
+    if scraped_email and scraped_email_raw:
+        # Compare cleaned versions
+        if scraped_email == clean_email_before_validation(scraped_email_raw):
+            scraped_email_raw = ""
+            row[col["scraped_email_raw"]] = ""
+
+    # scraped_email validáció
+    if scraped_email and not is_valid_email(scraped_email):
+        scraped_email = ""
+
+    # MINDIG frissítsd a row-t
+    row[col["scraped_email"]] = scraped_email
+
+    # 6) scraped_phone és scraped_whatsapp validáció
+    # (split_phones cache-elt: ha a két mező azonos, csak egyszer bontjuk)
+    phones_scraped = split_phones(row[col["scraped_phone"]])
+    phones_whatsapp = split_phones(row[col["scraped_whatsapp"]])
+    row[col["scraped_phone"]] = ", ".join(phones_scraped)
+    row[col["scraped_whatsapp"]] = ", ".join(phones_whatsapp)
+
+    # egyesített email lista: a validált scraped_email + a raw további emailjei
+    # (a globális dedup úgyis kisbetűsen megy, így itt is kisbetűs kulcs elég)
+    email_set = []
+    email_keys = set()
+    if scraped_email:
+        email_set.append(scraped_email)
+        email_keys.add(scraped_email.lower())
+    if scraped_email_raw:
+        for e in split_emails(scraped_email_raw):
+            key = e.lower()
+            if key not in email_keys:
+                email_keys.add(key)
+                email_set.append(e)
+
+    # Sort emails by business priority
+    if len(email_set) > 1:
+        email_set.sort(key=email_priority, reverse=True)
+
+    return row, email_set
+
+def _transform_chunk(rows, col):
+    return [transform_row(row, col) for row in rows]
+
+def _layout_rows(reader, width: int, add_simple: bool, add_country: bool):
+    """
+    Bemeneti listák kimeneti oszloprendbe: elöl simple_name, a végén country,
+    rövid sor üres cellákkal kiegészítve, üres sorok kihagyva (mint a DictReadernél).
+    """
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            row += [""] * (width - len(row))
+        elif len(row) > width:
+            del row[width:]
+        if add_simple:
+            row.insert(0, "")
+        if add_country:
+            row.append("")
+        yield row
+
+def _read_chunks(reader, size):
+    while True:
+        chunk = list(islice(reader, size))
+        if not chunk:
+            return
+        yield chunk
+
+def process(in_path: Path, out_path: Path, workers=None):
     # Global email deduplication across entire dataset
     global_emails_seen = set()
+
+    if workers is None:
+        # kis fájlnál a processzek indítása többe kerül, mint amit nyerünk
+        if in_path.stat().st_size >= PARALLEL_MIN_BYTES:
+            workers = os.cpu_count() or 1
+        else:
+            workers = 1
     
-    with in_path.open("r", encoding="utf-8-sig", newline="") as f_in:
-        reader = csv.DictReader(f_in)
-        fieldnames = reader.fieldnames or []
+    # Soronként írunk ki, nem gyűjtjük memóriába a teljes kimenetet
+    with in_path.open("r", encoding="utf-8-sig", newline="", buffering=IO_BUFFER_BYTES) as f_in, \
+         out_path.open("w", encoding="utf-8", newline="", buffering=IO_BUFFER_BYTES) as f_out:
+        # Pozíciós olvasás/írás: a sorok listák, az oszlopokat egyszer képezzük le indexre
+        reader = csv.reader(f_in)
+        header = next(reader, [])
 
         # új oszlopok
-        if "simple_name" not in fieldnames:
-            fieldnames = ["simple_name"] + fieldnames
-        if "country" not in fieldnames:
-            fieldnames = fieldnames + ["country"]
-
-        rows_out = []
-
-        for row in reader:
-            # 1) egyszerűsített név
-            name = row.get("name", "")
-            row["simple_name"] = simplify_name(name)
-
-            # 2) phone tisztítás + validáció
-            phone_raw = row.get("phone", "")
-            phones = split_phones(phone_raw)
-            row["phone"] = phones[0] if phones else ""
-
-            # 3) ország cím / plus code alapján
-            address = row.get("address", "")
-            plus_code = row.get("plus_code", "")
-            row["country"] = extract_country(address, plus_code)
-
-            # 4–5) email logika - ✅ TISZTÍTÁSSAL
-            scraped_email = clean_email_before_validation(row.get("scraped_email") or "")
-            scraped_email_raw = (row.get("scraped_email_raw") or "").strip()
-
-            # ha teljes egyezés, raw törlése
-            if scraped_email and scraped_email_raw:
-                # Compare cleaned versions
-                cleaned_raw = clean_email_before_validation(scraped_email_raw)
-                if scraped_email == cleaned_raw:
-                    scraped_email_raw = ""
-                    row["scraped_email_raw"] = ""
-
-            # scraped_email validáció
-            if scraped_email and not is_valid_email(scraped_email):
-                scraped_email = ""
-            
-            # MINDIG frissítsd a row-t
-            row["scraped_email"] = scraped_email
-
-            # raw további emailjei
-            if scraped_email_raw:
-                emails_from_raw = split_emails(scraped_email_raw)
-            else:
-                emails_from_raw = []
-
-            # 6) scraped_phone és scraped_whatsapp validáció
-            scraped_phone_raw = row.get("scraped_phone", "") or ""
-            scraped_whatsapp_raw = row.get("scraped_whatsapp", "") or ""
-
-            phones_scraped = split_phones(scraped_phone_raw)
-            phones_whatsapp = split_phones(scraped_whatsapp_raw)
-
-            row["scraped_phone"] = ", ".join(phones_scraped) if phones_scraped else ""
-            row["scraped_whatsapp"] = ", ".join(phones_whatsapp) if phones_whatsapp else ""
-
-            # egyesített email lista
-            email_set = []
-            if scraped_email and is_valid_email(scraped_email):
-                email_set.append(scraped_email)
-            for e in emails_from_raw:
-                if e not in email_set:
-                    email_set.append(e)
-
-            # Sort emails by business priority
-            email_set.sort(key=email_priority, reverse=True)
-
+        add_simple = "simple_name" not in header
+        add_country = "country" not in header
+        fieldnames = (["simple_name"] if add_simple else []) + header + (["country"] if add_country else [])
+        col = {name: i for i, name in enumerate(fieldnames)}
+        rows = _layout_rows(reader, len(header), add_simple, add_country)
+
+        writer = csv.writer(f_out)
+        writer.writerow(fieldnames)
+
+        # Üres vagy csak fejléces bemenet: a fejléc a teljes kimenet
+        # (az írt oszlopokat, pl. phone, scraped_email, csak sor esetén keressük)
+        first = next(rows, None)
+        if first is None:
+            return
+        rows = chain((first,), rows)
+
+        writerow = writer.writerow
+        email_idx = col["scraped_email"]
+        raw_idx = col.get("scraped_email_raw")
+
+        def emit(row, email_set):
             # ha nincs használható email: egy sor marad
             if not email_set:
-                rows_out.append(row)
-                continue
+                writerow(row)
+                return
 
             # ha van 1+ email: sor(oka)t duplikálunk, és a raw-t eldobjuk
             # GLOBAL DEDUPLICATION: csak olyan emaileket használunk, amik még nem voltak
+            if raw_idx is not None:
+                row[raw_idx] = ""
             for email in email_set:
-                if email.lower() in global_emails_seen:
+                key = email.lower()
+                if key in global_emails_seen:
                     continue  # már volt ilyen email másik cégnél
-                global_emails_seen.add(email.lower())
-                new_row = dict(row)
-                new_row["scraped_email"] = email
-                new_row["scraped_email_raw"] = ""
-                rows_out.append(new_row)
-
-    with out_path.open("w", encoding="utf-8", newline="") as f_out:
-        writer = csv.DictWriter(f_out, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows_out:
-            writer.writerow(r)
+                global_emails_seen.add(key)
+                row[email_idx] = email
+                writerow(row)
+
+        if workers <= 1:
+            for row in rows:
+                emit(*transform_row(row, col))
+            return
+
+        # A sorok tisztítása párhuzamosan megy, chunkonként; a globális dedup
+        # és az írás itt marad, bemeneti sorrendben (imap, nem imap_unordered).
+        # Hullámokban adagolunk, hogy ne olvassuk be az egész fájlt előre.
+        chunks = _read_chunks(rows, PARALLEL_CHUNK_ROWS)
+        transform_chunk = partial(_transform_chunk, col=col)
+        with Pool(workers) as pool:
+            while True:
+                wave = list(islice(chunks, workers * 2))
+                if not wave:
+                    break
+                for results in pool.imap(transform_chunk, wave):
+                    for row, email_set in results:
+                        emit(row, email_set)
 
 def main(argv=None):
     if argv is None:
@@ -12,7 +12,7 @@ from pathlib import Path
 import shutil
 import csv
 
-from telegram_notify import notify, stage_done, stage_failed, pipeline_summary
+from telegram_notify import notify, flush, stage_done, stage_failed, pipeline_summary
 
 logging.basicConfig(
     filename="run_all_log.txt",
@@ -37,7 +37,9 @@ GMAPS_ARTIFACTS = [
 
 SOCIAL_ARTIFACTS = [
     "input.csv",
+    "input.csv.enc",
     "output.csv",
+    "output.csv.enc",
     "output_cleared.csv",
     "scraper.log",
 ]
@@ -140,10 +142,30 @@ def sync_to_master_table(csv_path: Path):
 
 
 def count_csv_rows(filepath: Path) -> int:
-    """Count data rows in a CSV file."""
+    """Count data rows in a CSV file.
+
+    Counts newlines in 1 MB binary blocks instead of parsing every field;
+    newlines inside quoted values are skipped, so multi-line fields count once.
+    """
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return sum(1 for _ in csv.reader(f)) - 1  # minus header
+        rows = 0
+        in_quotes = False
+        last = b"\n"
+        with open(filepath, "rb") as f:
+            while True:
+                block = f.read(1 << 20)
+                if not block:
+                    break
+                # even/odd pieces between quote chars alternate outside/inside a quoted field
+                for i, part in enumerate(block.split(b'"')):
+                    if i:
+                        in_quotes = not in_quotes
+                    if not in_quotes:
+                        rows += part.count(b"\n")
+                last = block[-1:]
+        if last != b"\n":
+            rows += 1  # last record without trailing newline
+        return rows - 1  # minus header
     except Exception:
         return 0
 
@@ -440,4 +462,5 @@ if __name__ == "__main__":
     else:
         print("\n⚠️ Pipeline failed — keeping artifacts for resume on next run.")
 
+    flush()
     print("\n🏁 Done.")
@@ -1,10 +1,16 @@
 """
 Telegram notification helper for scraper pipeline.
 Usage: from telegram_notify import notify
+
+notify() only queues the message; a background thread sends them in order.
+flush() waits for the queue to drain (also run automatically at exit).
 """
 
 import requests
 import os
+import queue
+import atexit
+import threading
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -15,24 +21,56 @@ load_dotenv(ENV_PATH)
 TELEGRAM_BOT_TOKEN = os.environ["TELEGRAM_BOT_TOKEN"]
 TELEGRAM_CHAT_ID = os.environ["TELEGRAM_CHAT_ID"]
 INSTANCE_NAME = os.environ.get("INSTANCE_NAME", "scraper")
+API_BASE = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}"
 
+# One pooled keep-alive connection to the Bot API for the whole run
+session = requests.Session()
 
-def notify(message: str, silent: bool = False) -> bool:
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "HTML",
-        "disable_notification": silent,
-    }
+
+# Pending sendMessage payloads, drained by a single thread (keeps message order)
+_outbox = queue.Queue()
+
+
+def _send_message(payload: dict) -> bool:
     try:
-        r = requests.post(url, json=payload, timeout=10)
+        r = session.post(f"{API_BASE}/sendMessage", json=payload, timeout=10)
         return r.status_code == 200
     except Exception as e:
         print(f"⚠️ Telegram notify failed: {e}")
         return False
 
 
+def _drain():
+    while True:
+        payload = _outbox.get()
+        try:
+            _send_message(payload)
+        finally:
+            _outbox.task_done()
+
+
+threading.Thread(target=_drain, name="telegram-notify", daemon=True).start()
+
+
+def notify(message: str, silent: bool = False) -> bool:
+    """Queue a message without waiting on the Telegram API. Returns True once queued."""
+    _outbox.put({
+        "chat_id": TELEGRAM_CHAT_ID,
+        "text": message,
+        "parse_mode": "HTML",
+        "disable_notification": silent,
+    })
+    return True
+
+
+def flush():
+    """Block until every queued message has been sent (or failed)."""
+    _outbox.join()
+
+
+atexit.register(flush)
+
+
 def stage_done(stage: str, details: str = ""):
     ts = datetime.now().strftime("%H:%M:%S")
     msg = f"✅ [{INSTANCE_NAME}] <b>{stage}</b> done ({ts})"
@@ -61,14 +99,15 @@ def pipeline_summary(total_places: int = 0, social_found: int = 0, duration_sec:
 
 
 def send_file(filepath: str, caption: str = "") -> bool:
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendDocument"
+    flush()  # queued messages go out before the file
+    url = f"{API_BASE}/sendDocument"
     try:
         with open(filepath, "rb") as f:
             payload = {"chat_id": TELEGRAM_CHAT_ID}
             if caption:
                 payload["caption"] = caption
                 payload["parse_mode"] = "HTML"
-            r = requests.post(url, data=payload, files={"document": f}, timeout=30)
+            r = session.post(url, data=payload, files={"document": f}, timeout=30)
             return r.status_code == 200
     except Exception as e:
         print(f"⚠️ Telegram file send failed: {e}")